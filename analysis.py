@@ -0,0 +1,264 @@
+import cv2
+import numpy as np
+
+import colordata
+import colornames
+import huefamilies
+import metrics
+import palette
+import regionstats
+import shadeindex
+
+FAMILIES = ("red", "green", "blue")
+
+# HSV ranges used to find the regions each family's shades are measured on
+DETECTION_RANGES = {family: huefamilies.detection_ranges(huefamilies.SPECS[family]) for family in FAMILIES}
+
+PREVIEW_SIZE = (500, 500)
+DOMINANT_SIZE = (300, 300)
+# analyze() measures shades on at least this many pixels each way: bigger JPEGs decode at reduced scale
+ANALYSIS_SIZE = (2000, 2000)
+# Regions with fewer pixels are noise to the shade detector
+MIN_SHADE_AREA = 150
+
+
+# JPEG scale-on-decode flags, coarsest first
+REDUCED_DECODES = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# JPEG start-of-frame markers, which carry the image dimensions
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def jpeg_size(data):
+    """ Reads (width, height) from a JPEG header without decoding it. Returns None for anything else. """
+    if data[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # Fill byte
+            i += 1
+            continue
+        if marker in _SOF_MARKERS:
+            height = int.from_bytes(data[i + 5:i + 7], "big")
+            width = int.from_bytes(data[i + 7:i + 9], "big")
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:  # Markers without a length
+            i += 2
+            continue
+        i += 2 + int.from_bytes(data[i + 2:i + 4], "big")
+    return None
+
+
+def decode_flag(data, cover):
+    """
+    The imdecode flag for the smallest scale-on-decode of a JPEG that is still at least
+    cover = (width, height) in both directions. Either orientation is assumed to fit,
+    as EXIF rotation is applied after the decoder picks its size.
+    """
+    size = jpeg_size(data)
+    if size is None or cover is None:
+        return cv2.IMREAD_COLOR
+    shortest, needed = min(size), max(cover)
+    for factor, flag in REDUCED_DECODES:
+        if -(-shortest // factor) >= needed:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def load_image(image, cover=None):
+    """
+    Decodes an image path or raw file bytes to BGR. Arrays are passed through untouched.
+    With cover = (width, height), JPEGs are decoded at 1/2, 1/4 or 1/8 scale when that
+    still covers the size the caller works at, which is far cheaper than a full decode.
+    """
+    return load_image_sized(image, cover)[0]
+
+
+def load_image_sized(image, cover=None):
+    """
+    load_image, also returning the (width, height) of the JPEG header, so callers can tell
+    how much a reduced-scale decode shrank the image. The size is None for arrays, other
+    formats and paths decoded without cover, which always come back at full size.
+    """
+    if isinstance(image, np.ndarray):
+        return image, None
+    with metrics.span("decode"):
+        if not isinstance(image, (bytes, bytearray, memoryview)):
+            if cover is None:
+                return cv2.imread(image), None
+            try:
+                with open(image, "rb") as f:
+                    image = f.read()
+            except OSError:
+                return None, None
+        return cv2.imdecode(np.frombuffer(image, np.uint8), decode_flag(image, cover)), jpeg_size(image)
+
+
+@metrics.timed("colour_conversion")
+def build_planes(image):
+    """ Builds every colour plane the detectors read, each exactly once. """
+    preview = cv2.resize(image, PREVIEW_SIZE)
+    preview_denoised = cv2.medianBlur(cv2.GaussianBlur(preview, (5, 5), 0), 5)
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    return {
+        "bgr": image,
+        "hsv": hsv,
+        "preview": preview,
+        "preview_hsv": cv2.cvtColor(preview, cv2.COLOR_BGR2HSV),
+        "preview_denoised_hsv": cv2.cvtColor(preview_denoised, cv2.COLOR_BGR2HSV),
+        "preview_denoised_lab": cv2.cvtColor(preview_denoised, cv2.COLOR_BGR2LAB),
+        "families": huefamilies.classify(hsv),
+    }
+
+
+def family_mask(hsv, family):
+    """ One family's detection ranges as a 0/255 mask of an HSV image. """
+    mask = np.zeros(hsv.shape[:2], np.uint8)
+    for lower, upper in huefamilies.detection_ranges(huefamilies.SPECS[family]):
+        cv2.bitwise_or(mask, cv2.inRange(hsv, np.array(lower), np.array(upper)), dst=mask)
+    return mask
+
+
+def _preview_mask(planes, family):
+    """ The thresholding step of the hover viewers, on the 500x500 preview, as the family's spec describes it. """
+    preview = huefamilies.SPECS[family]["preview"]
+    plane = planes[preview["plane"]]
+    if "above" in preview:
+        _, mask = cv2.threshold(plane[:, :, preview["channel"]], preview["above"], 255, cv2.THRESH_BINARY)
+        return mask
+    mask = np.zeros(plane.shape[:2], np.uint8)
+    for lower, upper in preview["ranges"]:
+        cv2.bitwise_or(mask, cv2.inRange(plane, np.array(lower), np.array(upper)), dst=mask)
+    return mask
+
+
+@metrics.timed("contours")
+def find_regions(planes, family):
+    """ Returns the outlines of the family's regions in preview coordinates. """
+    mask = _preview_mask(planes, family)
+
+    kernel = np.ones((5, 5), np.uint8)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
+
+    spec = huefamilies.SPECS[family]
+    edges = cv2.Canny(mask, *spec["canny"])
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    if spec["min_region_area"] is not None:
+        contours = [cnt for cnt in contours if cv2.contourArea(cnt) > spec["min_region_area"]]
+    metrics.count("regions_found", len(contours))
+    return list(contours)
+
+
+def region_outlines(regions, tolerance=1.0):
+    """ Region outlines as JSON-friendly [[x, y], ...] lists, simplified to within tolerance pixels. """
+    return [cv2.approxPolyDP(cnt, tolerance, True).reshape(-1, 2).tolist() for cnt in regions]
+
+
+def region_labels(regions, shape):
+    """
+    Paints regions into an int32 label map: 0 outside every region, i + 1 inside
+    regions[i] and on its outline. Where outlines overlap the earlier region wins,
+    like testing the outlines in order with cv2.pointPolygonTest.
+    """
+    labels = np.zeros(shape[:2], np.int32)
+    for i in reversed(range(len(regions))):
+        cv2.drawContours(labels, regions, i, i + 1, thickness=cv2.FILLED)
+    return labels
+
+
+@metrics.timed("shade_match")
+def detect_shades(planes, family, min_area=MIN_SHADE_AREA):
+    """
+    Matches every region of the family with at least min_area pixels (smaller ones
+    are noise) to its closest predefined shade, by the mean colour of its own pixels.
+    """
+    stats = regionstats.region_stats(planes["bgr"], huefamilies.mask(planes["families"], family), min_area)
+    if not len(stats["label"]):
+        return []
+
+    # Closest shade of every region by LAB distance (perceptual difference), in one call
+    index = shadeindex.get_index(family, metric="lab")
+    detected_colors = {index["names"][i] for i in shadeindex.nearest(index, stats["mean_rgb"])}
+    return sorted(detected_colors)
+
+
+@metrics.timed("dominant")
+def dominant_color(image, k=5, size=DOMINANT_SIZE):
+    """
+    Returns the dominant colour of a BGR image with its names, mood and full palette.
+    The palette is taken from the image resized to size. The resize averages pixel
+    areas, so a full image and its reduced-scale decode give the same answer.
+    """
+    colors = palette.extract_palette(cv2.resize(image, size, interpolation=cv2.INTER_AREA), k)
+    rgb = colors[0]["rgb"]
+    name = shadeindex.nearest_name(shadeindex.get_index("names", metric="rgb"), rgb)
+    return {
+        "rgb": rgb,
+        "hex": "#{:02x}{:02x}{:02x}".format(*rgb),
+        "name": name,
+        "shade": colornames.closest_name(rgb)[0],
+        "mood": colordata.COLOR_MOODS.get(name, "Mood not defined for this color"),
+        "palette": colors,
+    }
+
+
+def analyze(image, families=FAMILIES, cover=ANALYSIS_SIZE):
+    """
+    Runs the red, green and blue detectors over one image.
+    The image is decoded and converted to HSV/LAB once, and every family
+    reads its regions, shades, moods and uses from the same planes.
+    Paths and bytes are decoded by load_image with cover, so JPEGs far larger than
+    cover are measured at reduced scale; the shade detector's min_area is scaled along
+    and still counts pixels of the full image. Callers that only need the preview pass
+    cover=PREVIEW_SIZE, and cover=None decodes at full size. Arrays are analysed as they are.
+    Returns None if the image cannot be loaded.
+    """
+    image, size = load_image_sized(image, cover)
+    if image is None:
+        return None
+    min_area = MIN_SHADE_AREA
+    if size is not None:
+        min_area *= image.shape[0] * image.shape[1] / (size[0] * size[1])
+    return analyze_planes(build_planes(image), families, min_area)
+
+
+def analyze_planes(planes, families=FAMILIES, min_area=MIN_SHADE_AREA):
+    """ analyze() on planes already built with build_planes. """
+    image = planes["bgr"]
+    result = {
+        "size": (image.shape[1], image.shape[0]),
+        "preview": planes["preview"],
+        "families": {},
+    }
+    for family in families:
+        spec = huefamilies.SPECS[family]
+        shades = detect_shades(planes, family, min_area)
+        result["families"][family] = {
+            "regions": find_regions(planes, family),
+            "shades": shades,
+            "moods": {shade: spec["moods"][shade] for shade in shades if shade in spec["moods"]},
+            "uses": {shade: spec["uses"][shade] for shade in shades if shade in spec["uses"]},
+        }
+    return result
+
+
+def summarize(result):
+    """ Keeps the JSON-friendly part of an analysis result: region boxes, shades, moods and uses. """
+    families = {}
+    for family, info in result["families"].items():
+        families[family] = {
+            "regions": [list(cv2.boundingRect(cnt)) for cnt in info["regions"]],
+            "shades": info["shades"],
+            "moods": info["moods"],
+            "uses": info["uses"],
+        }
+    return families
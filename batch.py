@@ -0,0 +1,152 @@
+""" Analyses whole image directories in parallel and streams one JSON line per image. """
+import argparse
+import functools
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import analysis
+import signature
+import warmup
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff", ".gif")
+
+
+def find_images(source):
+    """ Yields image paths from a directory (recursively) or a glob pattern, in sorted order. """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    yield os.path.join(root, name)
+    else:
+        yield from sorted(glob.iglob(source, recursive=True))
+
+
+def completed_paths(output_path):
+    """ Returns the paths already written to an earlier results file. """
+    done = set()
+    if output_path and os.path.exists(output_path):
+        with open(output_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["path"])
+                except (ValueError, KeyError):
+                    continue  # A line cut short by an interrupted run
+    return done
+
+
+def ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def process_image(path, signature_dir=None):
+    """
+    Analyses one image and returns its JSON line as a dict. With signature_dir, the image's
+    colour signature is saved there too, so later colour questions need no decoding.
+    An image that fails gets an error line instead of stopping the run.
+    """
+    try:
+        return _process_image(path, signature_dir)
+    except Exception as error:
+        return {"path": path, "error": f"{type(error).__name__}: {error}"}
+
+
+def _process_image(path, signature_dir):
+    image = analysis.load_image(path)
+    if image is None:
+        return {"path": path, "error": "Could not load image."}
+
+    result = analysis.analyze(image)
+    line = {
+        "path": path,
+        "dominant": analysis.dominant_color(image),
+        "families": analysis.summarize(result),
+    }
+    if signature_dir:
+        name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16] + ".csig"
+        signature.save(signature.compute(image), os.path.join(signature_dir, name))
+        line["signature"] = name
+    return line
+
+
+def run(paths, out, workers=None, report_every=1.0, signature_dir=None):
+    """
+    Spreads images over a process pool and writes each result as soon as it finishes.
+    At most a few images per worker are in flight, so memory stays flat on huge catalogues.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = last_report = time.perf_counter()
+    count = 0
+    process = functools.partial(process_image, signature_dir=signature_dir)
+    if signature_dir:
+        os.makedirs(signature_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=warmup.load_tables) as executor:
+        pending = set()
+        paths = iter(paths)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < workers * 4:
+                path = next(paths, None)
+                if path is None:
+                    exhausted = True
+                else:
+                    pending.add(executor.submit(process, path))
+            if not pending:
+                break
+
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                out.write(json.dumps(future.result()) + "\n")
+                count += 1
+            out.flush()
+
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                print(f"{count} images, {count / (now - start):.1f} images/sec", file=sys.stderr)
+                last_report = now
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Done: {count} images in {elapsed:.1f}s ({rate:.1f} images/sec)", file=sys.stderr)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("source", help="Image directory or glob pattern, e.g. 'photos/**/*.jpg'")
+    parser.add_argument("-o", "--output", help="Results file (JSON lines). Defaults to stdout.")
+    parser.add_argument("-w", "--workers", type=int, help="Worker processes. Defaults to the CPU count.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip images already present in --output and append to it.")
+    parser.add_argument("--signatures", metavar="DIR",
+                        help="Also save each image's colour signature (.csig) in this directory.")
+    args = parser.parse_args(argv)
+
+    paths = find_images(args.source)
+    if args.resume:
+        done = completed_paths(args.output)
+        paths = (path for path in paths if path not in done)
+
+    if args.output:
+        with open(args.output, "a" if args.resume else "w", encoding="utf-8") as out:
+            if args.resume and not ends_with_newline(args.output):
+                out.write("\n")  # Never append to a line cut short by an interrupted run
+            run(paths, out, args.workers, signature_dir=args.signatures)
+    else:
+        run(paths, sys.stdout, args.workers, signature_dir=args.signatures)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+""" Benchmarks every pipeline on the bundled sample images and fails on regressions against a saved baseline. """
+import argparse
+import glob
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+import analysis
+import batch
+import fusedfilter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "bench_baseline.json")
+SCALES = (0.25, 0.5, 1.0)
+
+# A stage is only flagged when it is this much slower than its baseline, and by more than the noise floor
+TOLERANCE = 0.25
+NOISE_FLOOR_MS = 2.0
+
+STAGES = {
+    "dominant": analysis.dominant_color,
+    "identify_red": lambda image: analysis.find_regions(analysis.build_planes(image), "red"),
+    "identify_green": lambda image: analysis.find_regions(analysis.build_planes(image), "green"),
+    "identify_blue": lambda image: analysis.find_regions(analysis.build_planes(image), "blue"),
+    "mood_uses_red": lambda image: analysis.analyze(image, ("red",)),
+    "mood_uses_green": lambda image: analysis.analyze(image, ("green",)),
+    "mood_uses_blue": lambda image: analysis.analyze(image, ("blue",)),
+    "filter_red": lambda image: fusedfilter.enhance(image, "red"),
+    "filter_green": lambda image: fusedfilter.enhance(image, "green"),
+    "filter_blue": lambda image: fusedfilter.enhance(image, "blue"),
+}
+
+# Degenerate inputs every stage must handle: solid images of a few pixels, in each hue family and black.
+# One-pixel images are where cv2 mistakes an array for a Scalar
+TINY_SHAPES = ((1, 1), (1, 2), (2, 1), (3, 3))
+TINY_COLORS = ((0, 0, 255), (0, 255, 0), (255, 0, 0), (0, 0, 0))
+
+
+def check_tiny_images(stages=STAGES):
+    """ Runs every stage on tiny solid BGR images. Returns one message per stage and input that raised. """
+    failures = []
+    for stage in stages:
+        for height, width in TINY_SHAPES:
+            for color in TINY_COLORS:
+                image = np.full((height, width, 3), color, np.uint8)
+                try:
+                    STAGES[stage](image)
+                except Exception as error:
+                    failures.append(f"{stage} {width}x{height} {color}: {type(error).__name__}: {error}")
+    return failures
+
+
+def sample_paths(directory=HERE):
+    return sorted(path for path in glob.glob(os.path.join(directory, "*"))
+                  if path.lower().endswith(batch.IMAGE_EXTENSIONS))
+
+
+def load_sample(path):
+    """ Decodes a sample; animations contribute their first frame. """
+    image = analysis.load_image(path)
+    if image is None:
+        capture = cv2.VideoCapture(path)
+        ok, image = capture.read()
+        capture.release()
+        image = image if ok else None
+    return image
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def run_stage(stage, paths, scales=SCALES, repeats=3):
+    """ Times one stage on every sample and scale in this process. Returns its rows and peak RSS. """
+    function = STAGES[stage]
+    rows = []
+    for path in paths:
+        original = load_sample(path)
+        if original is None:
+            continue
+        for scale in scales:
+            image = original if scale == 1.0 else cv2.resize(
+                original, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            function(image)  # Warm-up: tables, caches and thread pools
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                function(image)
+                times.append(time.perf_counter() - start)
+            seconds = statistics.median(times)
+            megapixels = image.shape[0] * image.shape[1] / 1e6
+            rows.append({
+                "sample": os.path.basename(path),
+                "scale": scale,
+                "size": [image.shape[1], image.shape[0]],
+                "ms": seconds * 1000,
+                "megapixels_per_sec": megapixels / seconds if seconds > 0 else 0.0,
+            })
+    return {"rows": rows, "peak_rss_mb": peak_rss_mb()}
+
+
+def run_stage_isolated(stage, paths, scales, repeats):
+    """ Runs a stage in a fresh interpreter so its peak RSS is its own. """
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", stage, "--repeats", str(repeats),
+         "--scales", ",".join(map(str, scales)), *paths],
+        capture_output=True, text=True, check=True, cwd=HERE,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """ Lists every stage, sample and scale that got slower or hungrier than the baseline. """
+    regressions = []
+    for stage, result in results.items():
+        if stage not in baseline:
+            continue
+        before = {(row["sample"], row["scale"]): row for row in baseline[stage]["rows"]}
+        for row in result["rows"]:
+            old = before.get((row["sample"], row["scale"]))
+            if old and row["ms"] > old["ms"] * (1 + tolerance) and row["ms"] - old["ms"] > NOISE_FLOOR_MS:
+                regressions.append(f"{stage} {row['sample']} x{row['scale']}: "
+                                   f"{old['ms']:.1f} ms -> {row['ms']:.1f} ms")
+        old_rss = baseline[stage]["peak_rss_mb"]
+        if result["peak_rss_mb"] > old_rss * (1 + tolerance):
+            regressions.append(f"{stage} peak RSS: {old_rss:.0f} MB -> {result['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("samples", nargs="*", help="Images to run on. Defaults to the bundled samples.")
+    parser.add_argument("-s", "--stage", action="append", choices=sorted(STAGES),
+                        help="Stage to run; repeat for several. Defaults to all.")
+    parser.add_argument("--scales", default=",".join(map(str, SCALES)),
+                        help="Comma-separated scale factors applied to every sample.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline JSON to compare against.")
+    parser.add_argument("--update", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    paths = args.samples or sample_paths()
+    scales = tuple(float(scale) for scale in args.scales.split(","))
+    if args.child:
+        print(json.dumps(run_stage(args.child, paths, scales, args.repeats)))
+        return 0
+
+    failures = check_tiny_images(args.stage or STAGES)
+    if failures:
+        print(f"{len(failures)} stages failed on tiny images:")
+        for failure in failures:
+            print("    " + failure)
+        return 1
+
+    results = {}
+    for stage in args.stage or STAGES:
+        results[stage] = run_stage_isolated(stage, paths, scales, args.repeats)
+        rows = results[stage]["rows"]
+        total = sum(row["ms"] for row in rows)
+        print(f"{stage:<16} {total:9.1f} ms total   peak RSS {results[stage]['peak_rss_mb']:7.1f} MB")
+        for row in rows:
+            print(f"    {row['sample']:<18} x{row['scale']:<5} {row['size'][0]:>5}x{row['size'][1]:<5}"
+                  f" {row['ms']:9.2f} ms {row['megapixels_per_sec']:8.1f} MP/s")
+
+    if args.update:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update to create one")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regressions against {args.baseline}:")
+        for regression in regressions:
+            print("    " + regression)
+        return 1
+    print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,28 @@
 import cv2
-import numpy as np
+
+import fusedfilter
+
+def enhance_blue_weak_image(img, edge_height=None):
+    """
+    Returns the blue-weak enhanced version of a BGR image without saving or showing it.
+    See fusedfilter.FILTERS["blue"] for the steps; edge_height computes the edge overlay
+    at preview resolution.
+    """
+    return fusedfilter.enhance(img, "blue", edge_height)
 
 def enhance_blue_weak(image_path, output_path="enhanced_blue.png"):
+    """ Enhances an image file for blue-weak vision, saves it and returns it. """
     # Load the image
     img = cv2.imread(image_path)
     if img is None:
         print("Error: Could not load image.")
-        return
-    
-    # Convert to LAB color space
-    lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
-    L, A, B = cv2.split(lab)
-
-    # 🌟 Shift blue tones to cyan (for better visibility)
-    B = cv2.add(B, 20)  # Increase blue channel intensity slightly
-    
-    # 🌟 Boost contrast using histogram equalization
-    L = cv2.equalizeHist(L)
-    
-    # Merge adjusted channels
-    enhanced_lab = cv2.merge([L, A, B])
-    enhanced_img = cv2.cvtColor(enhanced_lab, cv2.COLOR_LAB2BGR)
+        return None
 
-    # 🌟 Replace blue with purple for better visibility
-    hsv = cv2.cvtColor(enhanced_img, cv2.COLOR_BGR2HSV)
-    lower_blue = np.array([100, 40, 40])
-    upper_blue = np.array([140, 255, 255])
-    mask = cv2.inRange(hsv, lower_blue, upper_blue)
-    
-    # Replace blue with purple (BGR value for purple = [128, 0, 128])
-    enhanced_img[mask > 0] = [128, 0, 128]
-
-    # 🌟 Add edge highlighting for better object recognition
-    edges = cv2.Canny(enhanced_img, 100, 200)
-    enhanced_img[edges > 0] = [0, 0, 0]  # Black edges
+    enhanced_img = enhance_blue_weak_image(img)
+    cv2.imwrite(output_path, enhanced_img)  # Save enhanced image
+    return enhanced_img
 
+def show_enhanced(enhanced_img, title):
     # Resize the image for display
     height, width = enhanced_img.shape[:2]
     max_height = 500
@@ -44,12 +32,13 @@ def enhance_blue_weak(image_path, output_path="enhanced_blue.png"):
     else:
         enhanced_img_resized = enhanced_img
 
-    # Save and display result
-    cv2.imwrite(output_path, enhanced_img)  # Save enhanced image
-    cv2.imshow("Enhanced for Blue-weak Vision", enhanced_img_resized)  # Display the resized image
+    cv2.imshow(title, enhanced_img_resized)
     cv2.waitKey(0)
     cv2.destroyAllWindows()
 
-# Example usage
-image_path = "images/blueberry.jpeg"
-enhance_blue_weak(image_path)
+if __name__ == "__main__":
+    # Example usage
+    image_path = "images/blueberry.jpeg"
+    enhanced_img = enhance_blue_weak(image_path)
+    if enhanced_img is not None:
+        show_enhanced(enhanced_img, "Enhanced for Blue-weak Vision")
@@ -0,0 +1,168 @@
+""" Content-addressed result cache, in memory and on disk, with size-bounded LRU eviction. """
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
+
+import metrics
+
+MISSING = object()
+
+# Part of every key. Bump it whenever a cached result's shape or meaning changes,
+# so results computed by older code are never served again
+RESULTS_VERSION = 4
+
+
+def digest(data):
+    """ Content address of raw file bytes. """
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_key(content_digest, *params):
+    """ Cache key for one result of one image: the results version, the image digest and the parameters that shaped it. """
+    return hashlib.sha256(repr((RESULTS_VERSION, content_digest) + params).encode("utf-8")).hexdigest()
+
+
+def default_directory():
+    """ The per-user cache directory: $XDG_CACHE_HOME/colorsense, else ~/.cache/colorsense. """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "colorsense")
+
+
+def private_directory(directory):
+    """
+    Creates directory readable by this user only, or checks an existing one. Raises
+    PermissionError if another user owns it, since its entries could not be trusted.
+    """
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.stat(directory)
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"Cache directory {directory} is owned by another user")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        os.chmod(directory, 0o700)
+
+
+class ResultCache:
+    """
+    Keeps JSON results in memory up to memory_bytes and, with a directory,
+    on disk up to disk_bytes. Least recently used entries are evicted first.
+    Values must be JSON-serializable; read back from disk, tuples come back as
+    lists. Values handed out from memory are shared; callers must not modify them.
+    """
+
+    def __init__(self, directory=None, memory_bytes=256 << 20, disk_bytes=2 << 30):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self._memory = OrderedDict()  # key -> (value, size)
+        self._memory_size = 0
+        self._disk = OrderedDict()  # key -> size
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        if directory:
+            private_directory(directory)
+            self._scan_disk()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _scan_disk(self):
+        """ Picks up entries left by earlier runs, oldest first. """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                info = os.stat(os.path.join(self.directory, name))
+                entries.append((info.st_mtime, name[:-len(".json")], info.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_size += size
+
+    def _remember(self, key, value, size):
+        if key in self._memory:
+            self._memory_size -= self._memory.pop(key)[1]
+        if size > self.memory_bytes:
+            return
+        self._memory[key] = (value, size)
+        self._memory_size += size
+        while self._memory_size > self.memory_bytes:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._memory_size -= evicted
+
+    def _store(self, key, blob):
+        if key in self._disk:
+            self._disk_size -= self._disk.pop(key)
+        if len(blob) > self.disk_bytes:
+            return
+        # Written to a temporary file first so a crash never leaves half an entry
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as f:
+            f.write(blob)
+        os.replace(temporary, self._path(key))
+        self._disk[key] = len(blob)
+        self._disk_size += len(blob)
+        while self._disk_size > self.disk_bytes:
+            evicted, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            try:
+                os.remove(self._path(evicted))
+            except FileNotFoundError:
+                pass
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                metrics.count("cache_memory_hits")
+                return self._memory[key][0]
+            if key in self._disk:
+                try:
+                    with open(self._path(key), "rb") as f:
+                        blob = f.read()
+                    value = json.loads(blob)
+                except (OSError, ValueError):
+                    self._disk_size -= self._disk.pop(key)
+                else:
+                    self._disk.move_to_end(key)
+                    os.utime(self._path(key))
+                    self._remember(key, value, len(blob))
+                    self.hits["disk"] += 1
+                    metrics.count("cache_disk_hits")
+                    return value
+            self.misses += 1
+            metrics.count("cache_misses")
+            return default
+
+    def put(self, key, value):
+        blob = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self._remember(key, value, len(blob))
+            if self.directory:
+                self._store(key, blob)
+
+    def get_or_compute(self, key, compute, *args):
+        """ Returns the cached value for key, computing and storing it on a miss. """
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            value = compute(*args)
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits["memory"] + self.hits["disk"] + self.misses
+            return {
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_size,
+            }
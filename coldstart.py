@@ -0,0 +1,76 @@
+""" Measures how long a fresh worker process takes to import the library and get ready. """
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Modules a server or batch worker imports, cheapest first
+MODULES = [
+    "colordata",
+    "shadeindex",
+    "palette",
+    "colornames",
+    "analysis",
+    "dominantcolor",
+    "redfilter",
+    "greenfilter",
+    "bluefilter",
+    "moodred",
+    "usesred",
+    "redidentification",
+]
+
+# Imports plus the first-use work a worker does before its first image
+WARM_UP = (
+    "import analysis, colorbase, colornames, shadeindex;"
+    "colorbase.install();"
+    "[shadeindex.get_index(p, metric=m) for p in shadeindex.PALETTES for m in ('rgb', 'lab')];"
+    "colornames.load_vocabulary()"
+)
+
+TIMER = "import time; _start = time.perf_counter(); {code}; print(time.perf_counter() - _start)"
+
+
+def time_in_fresh_process(code, repeats=5):
+    """ Returns the median time a new interpreter spends running code, in seconds. """
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(code=code)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=0.5,
+                        help="Fail if a ready worker takes longer than this many seconds.")
+    args = parser.parse_args(argv)
+
+    for module in MODULES:
+        seconds = time_in_fresh_process(f"import {module}", args.repeats)
+        print(f"import {module:<20} {seconds * 1000:8.1f} ms")
+
+    ready = time_in_fresh_process(WARM_UP, args.repeats)
+    print(f"{'worker ready':<27} {ready * 1000:8.1f} ms")
+
+    # No module may pull in these at import time
+    leaked = subprocess.run(
+        [sys.executable, "-c", "import sys, analysis, dominantcolor, redfilter, greenfilter, bluefilter;"
+                               "print(' '.join(m for m in ('sklearn', 'scipy') if m in sys.modules))"],
+        capture_output=True, text=True, check=True,
+    ).stdout.strip()
+    if leaked:
+        print(f"Heavy modules imported eagerly: {leaked}")
+        return 1
+    if ready > args.budget:
+        print(f"Worker cold start {ready:.3f}s is over the {args.budget:.3f}s budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
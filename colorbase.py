@@ -0,0 +1,259 @@
+""" The colour knowledge base compiled into one memory-mappable file, so workers load it without rebuilding anything. """
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+
+import cv2
+import numpy as np
+
+import colordata
+import colornames
+import huefamilies
+import shadeindex
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASE_PATH = os.path.join(HERE, "colours.ckb")
+
+# Files the compiled tables are derived from; editing any of them makes a built base stale
+SOURCES = [
+    os.path.join(HERE, "colordata.py"),
+    os.path.join(HERE, "huefamilies.py"),
+    os.path.join(HERE, "shadeindex.py"),
+    colornames.COLOURS_PATH,
+]
+
+MAGIC = b"CKB\0"
+VERSION = 1
+_HEADER = struct.Struct("<4sHH20sI")  # magic, version, LUT bits, source digest, table of contents size
+ALIGNMENT = 64
+
+METRICS = ("rgb", "lab")
+
+_base = None
+
+
+def source_digest():
+    """ SHA-1 over the source files, plus the format version. Line endings do not count. """
+    digest = hashlib.sha1(str(VERSION).encode())
+    for path in SOURCES:
+        with open(path, "rb") as f:
+            digest.update(f.read().replace(b"\r\n", b"\n"))
+    return digest.digest()
+
+
+def _palette_tables(name, palette):
+    """ Arrays and strings for one shadeindex palette: both indexes with their LUTs, families, moods and uses. """
+    moods = colordata.COLOR_MOODS if name == "names" else colordata.MOODS.get(name, {})
+    uses = {} if name == "names" else colordata.USES.get(name, {})
+    names = list(palette)
+    strings = sorted(set(moods.values()) | set(uses.values()))
+    position = {text: i for i, text in enumerate(strings)}
+
+    arrays = {}
+    for metric in METRICS:
+        index = shadeindex.build_index(palette, metric)
+        arrays[f"{name}.{metric}.points"] = index["points"]
+        arrays[f"{name}.{metric}.norms"] = index["norms"]
+        arrays[f"{name}.{metric}.lut"] = shadeindex.get_lut(index)
+    rgb = index["rgb"]
+    arrays[f"{name}.rgb"] = rgb
+    arrays[f"{name}.families"] = huefamilies.classify(cv2.cvtColor(rgb.reshape(-1, 1, 3), cv2.COLOR_RGB2HSV)).ravel()
+    arrays[f"{name}.mood"] = np.array([position.get(moods.get(n), -1) for n in names], np.int16)
+    arrays[f"{name}.uses"] = np.array([position.get(uses.get(n), -1) for n in names], np.int16)
+    return arrays, {f"{name}.names": names, f"{name}.strings": strings}
+
+
+def compile_tables():
+    """ Everything the base holds, built from the sources: ({name: array}, {name: [str]}). """
+    arrays, strings = {}, {}
+    for name, palette in shadeindex.PALETTES.items():
+        palette_arrays, palette_strings = _palette_tables(name, palette)
+        arrays.update(palette_arrays)
+        strings.update(palette_strings)
+
+    vocabulary = colornames.read_vocabulary()
+    arrays["vocabulary.rgb"] = vocabulary["rgb"]
+    arrays["vocabulary.lab"] = vocabulary["lab"]
+    strings["vocabulary.names"] = vocabulary["names"]
+    strings["vocabulary.hex"] = vocabulary["hex"]
+    return arrays, strings
+
+
+def _data_start(toc_size):
+    start = _HEADER.size + toc_size
+    return start + -start % ALIGNMENT
+
+
+def build(path=BASE_PATH):
+    """
+    Compiles the colour tables and writes them to path: a fixed header, a JSON table
+    of contents, then every array at a 64-byte aligned offset. Strings are stored as
+    newline-joined UTF-8 blobs. Written to a temporary file and renamed into place,
+    so a worker never maps a half-written base.
+    """
+    arrays, strings = compile_tables()
+    blobs = {name: "\n".join(values).encode("utf-8") for name, values in strings.items()}
+
+    contents = {"families": huefamilies.ORDER, "arrays": {}, "strings": {}}
+    offset = 0
+    chunks = []
+    for kind, items in (("arrays", arrays), ("strings", blobs)):
+        for name, value in items.items():
+            data = value.tobytes() if kind == "arrays" else value
+            offset += -offset % ALIGNMENT
+            chunks.append((offset, data))
+            if kind == "arrays":
+                contents["arrays"][name] = [offset, value.dtype.str, list(value.shape)]
+            else:
+                contents["strings"][name] = [offset, len(data), len(strings[name])]
+            offset += len(data)
+
+    toc = json.dumps(contents, separators=(",", ":")).encode("utf-8")
+    start = _data_start(len(toc))
+    header = _HEADER.pack(MAGIC, VERSION, shadeindex.LUT_BITS, source_digest(), len(toc))
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(header + toc)
+        for chunk_offset, data in chunks:
+            f.seek(start + chunk_offset)
+            f.write(data)
+    os.replace(temporary, path)
+    return path
+
+
+def read_header(path=BASE_PATH):
+    """ Returns (version, LUT bits, source digest, table of contents size, table of contents) of a built base. """
+    with open(path, "rb") as f:
+        magic, version, bits, digest, toc_size = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a colour knowledge base")
+        return version, bits, digest, toc_size, json.loads(f.read(toc_size))
+
+
+def _current_header(path):
+    try:
+        header = read_header(path)
+    except (OSError, ValueError):
+        return None
+    version, bits, digest = header[:3]
+    if version != VERSION or bits != shadeindex.LUT_BITS or digest != source_digest():
+        return None
+    return header
+
+
+def is_current(path=BASE_PATH):
+    """ True when path exists and was built by this version from the current sources. """
+    return _current_header(path) is not None
+
+
+def load(path=BASE_PATH):
+    """
+    Memory-maps a built base. Returns {"arrays": {name: read-only array}, "strings":
+    {name: [str]}, "families": [...]}, or None when it is missing or stale. The arrays
+    are views of the page cache, so every process mapping the file shares one copy.
+    """
+    header = _current_header(path)
+    if header is None:
+        return None
+    toc_size, contents = header[3:]
+    start = _data_start(toc_size)
+
+    mapped = np.memmap(path, np.uint8, mode="r")
+    arrays = {}
+    for name, (offset, dtype, shape) in contents["arrays"].items():
+        arrays[name] = np.frombuffer(mapped, dtype, int(np.prod(shape)), start + offset).reshape(shape)
+    strings = {}
+    for name, (offset, size, count) in contents["strings"].items():
+        text = bytes(mapped[start + offset:start + offset + size]).decode("utf-8")
+        strings[name] = text.split("\n") if count else []
+    return {"arrays": arrays, "strings": strings, "families": contents["families"]}
+
+
+def get_base(path=BASE_PATH):
+    """ The mapped base, loaded once per process. None when it has not been built. """
+    global _base
+    if _base is None or _base["path"] != path:
+        base = load(path)
+        if base is None:
+            return None
+        _base = dict(base, path=path)
+    return _base
+
+
+def install(path=BASE_PATH):
+    """
+    Hands the mapped indexes to shadeindex and the vocabulary to colornames, so their
+    first lookups need no building. Returns False, leaving both to build their own
+    tables as before, when the base is missing or stale.
+    """
+    base = get_base(path)
+    if base is None:
+        return False
+    arrays, strings = base["arrays"], base["strings"]
+    for name in shadeindex.PALETTES:
+        if f"{name}.names" not in strings:
+            continue
+        for metric in METRICS:
+            shadeindex.install_index(name, metric, {
+                "names": strings[f"{name}.names"],
+                "rgb": arrays[f"{name}.rgb"],
+                "metric": metric,
+                "points": arrays[f"{name}.{metric}.points"],
+                "norms": arrays[f"{name}.{metric}.norms"],
+                "lut": arrays[f"{name}.{metric}.lut"],
+            })
+    colornames.install_vocabulary({
+        "path": colornames.COLOURS_PATH,
+        "names": strings["vocabulary.names"],
+        "hex": strings["vocabulary.hex"],
+        "rgb": arrays["vocabulary.rgb"],
+        "lab": arrays["vocabulary.lab"],
+    })
+    return True
+
+
+def describe(palette, name, path=BASE_PATH):
+    """ The compiled record of one shade: its RGB, hue families, mood and uses. None if unknown. """
+    base = get_base(path)
+    if base is None:
+        return None
+    arrays, strings = base["arrays"], base["strings"]
+    names = strings.get(f"{palette}.names", [])
+    if name not in names:
+        return None
+    i = names.index(name)
+    texts = strings[f"{palette}.strings"]
+    mood, uses = int(arrays[f"{palette}.mood"][i]), int(arrays[f"{palette}.uses"][i])
+    bits = int(arrays[f"{palette}.families"][i])
+    return {
+        "name": name,
+        "rgb": tuple(int(c) for c in arrays[f"{palette}.rgb"][i]),
+        "families": [family for bit, family in enumerate(base["families"]) if bits & (1 << bit)],
+        "mood": texts[mood] if mood >= 0 else None,
+        "uses": texts[uses] if uses >= 0 else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("-o", "--output", default=BASE_PATH, help="Path of the compiled base.")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        path = build(args.output)
+        print(f"Wrote {path} ({os.path.getsize(path) / 1024:.0f} KiB)")
+        return 0
+    if is_current(args.output):
+        print(f"{args.output} is up to date")
+        return 0
+    print(f"{args.output} is missing or stale; run: python colorbase.py build")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+""" Colour names, shades, moods and uses shared by the detectors. """
+
+# Expanded color dictionary with more colors and their RGB values
+COLOR_NAMES = {
+    "Red": (255, 0, 0), "Green": (0, 255, 0), "Blue": (0, 0, 255),
+    "Yellow": (255, 255, 0), "Cyan": (0, 255, 255), "Magenta": (255, 0, 255),
+    "Black": (0, 0, 0), "White": (255, 255, 255), "Gray": (128, 128, 128),
+    "Orange": (255, 165, 0), "Pink": (255, 192, 203), "Purple": (128, 0, 128),
+    "Brown": (165, 42, 42), "Lime": (0, 255, 0), "Navy": (0, 0, 128),
+    "Teal": (0, 128, 128), "Olive": (128, 128, 0), "Maroon": (128, 0, 0),
+    "Silver": (192, 192, 192), "Gold": (255, 215, 0), "Beige": (245, 245, 220),
+    "Coral": (255, 127, 80), "Turquoise": (64, 224, 208), "Indigo": (75, 0, 130),
+    "Lavender": (230, 230, 250), "Chocolate": (210, 105, 30), "Salmon": (250, 128, 114),
+    "Crimson": (220, 20, 60), "Orchid": (218, 112, 214), "Dark Green": (0, 100, 0),
+    "Deep Pink": (255, 20, 147), "Light Blue": (173, 216, 230), "Sky Blue": (135, 206, 235),
+    "Forest Green": (34, 139, 34), "Tomato": (255, 99, 71), "Dark Orange": (255, 140, 0),
+    "Slate Gray": (112, 128, 144), "Sea Green": (46, 139, 87), "Midnight Blue": (25, 25, 112),
+}
+
+# Mood dictionary mapping colors to moods
+COLOR_MOODS = {
+    "Red": "Passion, Energy, Excitement",
+    "Green": "Nature, Growth, Harmony",
+    "Blue": "Calm, Trust, Serenity",
+    "Yellow": "Happiness, Optimism, Creativity",
+    "Cyan": "Refreshment, Clarity, Communication",
+    "Magenta": "Imagination, Innovation, Spirituality",
+    "Black": "Mystery, Elegance, Power",
+    "White": "Purity, Simplicity, Cleanliness",
+    "Gray": "Neutrality, Balance, Sophistication",
+    "Orange": "Enthusiasm, Fun, Warmth",
+    "Pink": "Love, Compassion, Playfulness",
+    "Purple": "Royalty, Luxury, Ambition",
+    "Brown": "Stability, Reliability, Comfort",
+    "Lime": "Freshness, Zest, Vitality",
+    "Navy": "Professionalism, Confidence, Authority",
+    "Teal": "Sophistication, Healing, Protection",
+    "Olive": "Peace, Wisdom, Resilience",
+    "Maroon": "Strength, Courage, Passion",
+    "Silver": "Modern, Futuristic, High-tech",
+    "Gold": "Wealth, Success, Prosperity",
+    "Beige": "Relaxation, Warmth, Neutrality",
+    "Coral": "Warmth, Sociability, Approachability",
+    "Turquoise": "Calmness, Clarity, Emotional Balance",
+    "Indigo": "Intuition, Depth, Mystery",
+    "Lavender": "Grace, Elegance, Femininity",
+    "Chocolate": "Comfort, Reliability, Earthiness",
+    "Salmon": "Warmth, Friendliness, Approachability",
+    "Crimson": "Power, Love, Intensity",
+    "Orchid": "Luxury, Mystery, Creativity",
+    "Dark Green": "Prestige, Wealth, Stability",
+    "Deep Pink": "Romance, Playfulness, Boldness",
+    "Light Blue": "Peace, Tranquility, Softness",
+    "Sky Blue": "Openness, Freedom, Inspiration",
+    "Forest Green": "Nature, Freshness, Renewal",
+    "Tomato": "Energy, Warmth, Vibrancy",
+    "Dark Orange": "Adventure, Confidence, Success",
+    "Slate Gray": "Formality, Professionalism, Neutrality",
+    "Sea Green": "Refreshment, Healing, Renewal",
+    "Midnight Blue": "Dignity, Intelligence, Authority",
+}
+
+# Red shades with their RGB values
+RED_SHADES = {
+    "Bright Red": (255, 0, 13),
+    "Lipstick Red": (192, 2, 47),
+    "Rusty Red": (175, 47, 13),
+    "Fire Engine Red": (254, 0, 2),
+    "Deep Red": (154, 2, 0),
+    "Cherry Red": (247, 2, 42),
+    "Scarlet": (190, 1, 25),
+    "Rose Red": (190, 1, 60),
+    "Crimson": (153, 0, 0),
+    "Maroon": (128, 0, 0),
+    "Vermilion": (227, 66, 52),
+    "Burgundy": (128, 0, 32),
+    "Carmine": (150, 0, 24),
+    "Coral Red": (255, 64, 64),
+    "Ruby Red": (155, 17, 30),
+    "Blood Red": (102, 0, 0),
+    "Tomato Red": (255, 99, 71),
+    "Salmon Red": (250, 128, 114),
+    "Dark Red": (139, 0, 0),
+    "Indian Red": (205, 92, 92),
+}
+
+# Moods associated with each red shade
+RED_MOODS = {
+    "Bright Red": "Energetic, Passionate, and Exciting.",
+    "Lipstick Red": "Bold, Confident, and Glamorous.",
+    "Rusty Red": "Warm, Earthy, and Vintage.",
+    "Fire Engine Red": "Urgent, Attention-Grabbing, and Intense.",
+    "Deep Red": "Mysterious, Sophisticated, and Powerful.",
+    "Cherry Red": "Playful, Sweet, and Romantic.",
+    "Scarlet": "Daring, Fiery, and Ambitious.",
+    "Rose Red": "Elegant, Feminine, and Warm.",
+    "Crimson": "Dramatic, Luxurious, and Passionate.",
+    "Maroon": "Classic, Refined, and Traditional.",
+    "Vermilion": "Warm, Friendly, and Energetic.",
+    "Burgundy": "Mature, Deep, and Sophisticated.",
+    "Carmine": "Rich, Sensual, and Artistic.",
+    "Coral Red": "Cheerful, Fresh, and Lively.",
+    "Ruby Red": "Luxurious, Romantic, and Strong.",
+    "Blood Red": "Intense, Strong, and Passionate.",
+    "Tomato Red": "Friendly, Warm, and Approachable.",
+    "Salmon Red": "Soft, Playful, and Comforting.",
+    "Dark Red": "Serious, Deep, and Mysterious.",
+    "Indian Red": "Exotic, Cultural, and Warm.",
+}
+
+# Common uses of each red shade
+RED_USES = {
+    "Bright Red": "Used in high-energy designs, branding, and warning signs.",
+    "Lipstick Red": "Common in cosmetics, fashion, and bold statement pieces.",
+    "Rusty Red": "Popular in vintage themes, autumn palettes, and home decor.",
+    "Fire Engine Red": "Seen in emergency vehicles, alarms, and safety signs.",
+    "Deep Red": "Used in luxury branding, formal wear, and classic themes.",
+    "Cherry Red": "Common in food branding, vibrant fashion, and passion themes.",
+    "Scarlet": "Popular in sports branding, national flags, and intense visuals.",
+    "Rose Red": "Used in romance themes, floral designs, and beauty products.",
+    "Crimson": "Found in university branding, regal aesthetics, and deep tones.",
+    "Maroon": "Popular in academia, formal wear, and elegant interiors.",
+    "Vermilion": "Used in cultural art, Asian designs, and bold branding.",
+    "Burgundy": "Common in wine branding, high-end fashion, and formal decor.",
+    "Carmine": "Used in makeup, traditional art, and bold clothing.",
+    "Coral Red": "Popular in summer fashion, tropical themes, and fresh aesthetics.",
+    "Ruby Red": "Found in jewelry, luxury branding, and passionate themes.",
+    "Blood Red": "Used in gothic themes, horror aesthetics, and deep emotions.",
+    "Tomato Red": "Common in food branding, fresh produce, and kitchen designs.",
+    "Salmon Red": "Seen in soft pastels, warm interiors, and beachwear.",
+    "Dark Red": "Popular in historical themes, vintage aesthetics, and classic branding.",
+    "Indian Red": "Used in rustic themes, earthy tones, and cultural designs.",
+}
+
+# Green shades with their RGB values
+GREEN_SHADES = {
+    "Bright Green": (1, 255, 7),
+    "Kelly Green": (2, 171, 46),
+    "Lime Green": (137, 254, 5),
+    "Forest Green": (6, 71, 12),
+    "Shamrock Green": (2, 193, 77),
+    "Emerald Green": (2, 143, 30),
+    "Olive Green": (103, 122, 4),
+    "Jungle Green": (4, 130, 67),
+    "Moss Green": (138, 154, 91),
+    "Neon Green": (57, 255, 20),
+    "Dark Green": (0, 100, 0),
+    "Sea Green": (46, 139, 87),
+    "Spring Green": (0, 255, 127),
+    "Mint Green": (152, 255, 152),
+    "Hunter Green": (53, 94, 59),
+    "Teal Green": (0, 128, 128),
+    "Fern Green": (79, 121, 66),
+    "Army Green": (75, 83, 32),
+    "Chartreuse": (127, 255, 0),
+    "Pine Green": (1, 121, 111),
+}
+
+# Moods associated with each green shade
+GREEN_MOODS = {
+    "Bright Green": "Energizing, refreshing, and lively.",
+    "Kelly Green": "Balanced, traditional, and natural.",
+    "Lime Green": "Playful, youthful, and vibrant.",
+    "Forest Green": "Grounded, natural, and soothing.",
+    "Shamrock Green": "Lucky, cheerful, and positive.",
+    "Emerald Green": "Elegant, luxurious, and rich.",
+    "Olive Green": "Earthy, serious, and classic.",
+    "Jungle Green": "Adventurous, deep, and calming.",
+    "Moss Green": "Muted, organic, and peaceful.",
+    "Neon Green": "Bold, exciting, and futuristic.",
+    "Dark Green": "Sophisticated, deep, and resilient.",
+    "Sea Green": "Tranquil, oceanic, and fresh.",
+    "Spring Green": "Growth-oriented, lively, and youthful.",
+    "Mint Green": "Cool, calming, and rejuvenating.",
+    "Hunter Green": "Strong, authoritative, and grounded.",
+    "Teal Green": "Balanced, refreshing, and creative.",
+    "Fern Green": "Natural, earthy, and reliable.",
+    "Army Green": "Tough, rugged, and neutral.",
+    "Chartreuse": "Energetic, innovative, and unique.",
+    "Pine Green": "Refreshing, deep, and stable.",
+}
+
+# Common uses of each green shade
+GREEN_USES = {
+    "Bright Green": "Used in fresh, energetic designs, nature themes, and tech branding.",
+    "Kelly Green": "Common in sports team uniforms, St. Patrick’s Day themes, and landscapes.",
+    "Lime Green": "Popular in advertising, youth brands, and eco-friendly marketing.",
+    "Forest Green": "Used in military gear, nature photography, and outdoor branding.",
+    "Shamrock Green": "Seen in Irish heritage, finance logos, and vibrant landscapes.",
+    "Emerald Green": "Common in luxury branding, jewelry, and high-end fashion.",
+    "Olive Green": "Used in military camouflage, autumn fashion, and rustic themes.",
+    "Jungle Green": "Found in tropical designs, environmental campaigns, and jungle-themed visuals.",
+    "Moss Green": "Popular in earthy aesthetics, nature decor, and rustic branding.",
+    "Neon Green": "Used in high-visibility signs, sports branding, and neon aesthetics.",
+    "Dark Green": "Common in classic suits, banking, and academic settings.",
+    "Sea Green": "Ideal for coastal themes, aquariums, and relaxation spaces.",
+    "Spring Green": "Seen in spring fashion, floral designs, and organic branding.",
+    "Mint Green": "Used in soft pastels, cosmetics, and fresh-themed designs.",
+    "Hunter Green": "Popular in hunting gear, formal menswear, and preppy fashion.",
+    "Teal Green": "Found in modern web designs, medical branding, and ocean aesthetics.",
+    "Fern Green": "Used in botanical themes, home decor, and organic branding.",
+    "Army Green": "Common in military clothing, survival gear, and rugged fashion.",
+    "Chartreuse": "Popular in bold fashion, bright advertising, and modern designs.",
+    "Pine Green": "Seen in Christmas decorations, nature themes, and eco-conscious branding.",
+}
+
+# Blue shades with their RGB values
+BLUE_SHADES = {
+    "Bright Blue": (1, 101, 252),
+    "Royal Blue": (5, 4, 170),
+    "Deep Sky Blue": (13, 117, 248),
+    "Cobalt Blue": (3, 10, 167),
+    "Navy Blue": (0, 17, 70),
+    "Azure": (6, 154, 243),
+    "Steel Blue": (90, 125, 154),
+    "Electric Blue": (6, 82, 255),
+    "Turquoise": (64, 224, 208),
+    "Cyan": (0, 255, 255),
+    "Midnight Blue": (25, 25, 112),
+    "Periwinkle": (204, 204, 255),
+    "Baby Blue": (137, 207, 240),
+    "Ice Blue": (214, 245, 255),
+    "Dodger Blue": (30, 144, 255),
+    "Prussian Blue": (0, 49, 83),
+    "Sapphire Blue": (15, 82, 186),
+    "Cornflower Blue": (100, 149, 237),
+    "Denim Blue": (21, 96, 189),
+    "Sky Blue": (135, 206, 235),
+}
+
+# Moods associated with each blue shade
+BLUE_MOODS = {
+    "Bright Blue": "Energetic and refreshing",
+    "Royal Blue": "Elegant and trustworthy",
+    "Deep Sky Blue": "Inspiring and uplifting",
+    "Cobalt Blue": "Strong and bold",
+    "Navy Blue": "Serious and authoritative",
+    "Azure": "Calm and peaceful",
+    "Steel Blue": "Cool and industrial",
+    "Electric Blue": "Exciting and futuristic",
+    "Turquoise": "Healing and tropical",
+    "Cyan": "Refreshing and dynamic",
+    "Midnight Blue": "Mysterious and deep",
+    "Periwinkle": "Soft and dreamy",
+    "Baby Blue": "Gentle and innocent",
+    "Ice Blue": "Chill and serene",
+    "Dodger Blue": "Modern and vibrant",
+    "Prussian Blue": "Historical and intellectual",
+    "Sapphire Blue": "Luxurious and confident",
+    "Cornflower Blue": "Friendly and warm",
+    "Denim Blue": "Casual and comfortable",
+    "Sky Blue": "Relaxing and open",
+}
+
+# Common uses of each blue shade
+BLUE_USES = {
+    "Bright Blue": "Used in vibrant designs, tech, and modern branding.",
+    "Royal Blue": "Common in sports team logos, business suits, and formal attire.",
+    "Deep Sky Blue": "Ideal for sky-related visuals, aviation, and technology.",
+    "Cobalt Blue": "Popular in ceramics, glass art, and fashion.",
+    "Navy Blue": "Used in military, corporate branding, and nautical themes.",
+    "Azure": "Great for digital branding, ocean themes, and modern designs.",
+    "Steel Blue": "Used in industrial, automotive, and architectural designs.",
+    "Electric Blue": "Common in neon signs, high-energy designs, and tech products.",
+    "Turquoise": "Found in jewelry, tropical designs, and wellness branding.",
+    "Cyan": "Used in printing, UI design, and water-related themes.",
+    "Midnight Blue": "Popular for elegant fashion, deep space visuals, and classic themes.",
+    "Periwinkle": "Seen in pastels, soft aesthetics, and calming designs.",
+    "Baby Blue": "Used in baby products, soft-themed branding, and casual wear.",
+    "Ice Blue": "Ideal for winter-themed designs, ice-related visuals, and cool aesthetics.",
+    "Dodger Blue": "Common in digital media, sports brands, and signage.",
+    "Prussian Blue": "Historically used in art, dyes, and technical drawings.",
+    "Sapphire Blue": "Popular in gemstones, luxury branding, and high-end fashion.",
+    "Cornflower Blue": "Great for floral designs, subtle branding, and soft color schemes.",
+    "Denim Blue": "Common in clothing, casual wear, and rugged themes.",
+    "Sky Blue": "Used in relaxation spaces, branding, and weather-related themes.",
+}
+
+SHADES = {"red": RED_SHADES, "green": GREEN_SHADES, "blue": BLUE_SHADES}
+MOODS = {"red": RED_MOODS, "green": GREEN_MOODS, "blue": BLUE_MOODS}
+USES = {"red": RED_USES, "green": GREEN_USES, "blue": BLUE_USES}
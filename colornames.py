@@ -0,0 +1,132 @@
+""" Names colours against the full Colours.json vocabulary using CIEDE2000. """
+import json
+import os
+
+import cv2
+import numpy as np
+
+COLOURS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Colours.json")
+
+_vocabulary = None
+
+
+def hex_to_rgb(hex_color):
+    return tuple(int(hex_color[i:i+2], 16) for i in (1, 3, 5))
+
+
+def rgb_to_cielab(rgb):
+    """ Converts an (..., 3) array of 8-bit RGB values to CIELAB (L in 0-100). """
+    rgb = np.asarray(rgb, np.float32)
+    lab = cv2.cvtColor((rgb / 255.0).reshape(-1, 1, 3), cv2.COLOR_RGB2LAB)
+    return lab.reshape(rgb.shape)
+
+
+def read_vocabulary(path=COLOURS_PATH):
+    """ Reads Colours.json and computes the LAB coordinates of every entry. """
+    with open(path, encoding="utf-8") as f:
+        colours = json.load(f)
+    rgb = np.array([hex_to_rgb(code) for code in colours.values()], np.uint8)
+    return {
+        "path": path,
+        "names": list(colours),
+        "hex": list(colours.values()),
+        "rgb": rgb,
+        "lab": rgb_to_cielab(rgb),
+    }
+
+
+def load_vocabulary(path=COLOURS_PATH):
+    """ Loads Colours.json once and precomputes the LAB coordinates of every entry. """
+    global _vocabulary
+    if _vocabulary is None or _vocabulary["path"] != path:
+        _vocabulary = read_vocabulary(path)
+    return _vocabulary
+
+
+def install_vocabulary(vocabulary):
+    """ Uses a prebuilt vocabulary (see colorbase) instead of reading Colours.json. """
+    global _vocabulary
+    _vocabulary = vocabulary
+
+
+def ciede2000(lab1, lab2):
+    """
+    CIEDE2000 colour difference between two broadcastable (..., 3) LAB arrays.
+    Follows Sharma, Wu and Dalal (2005), including the hue wrap-around cases.
+    """
+    lab1 = np.asarray(lab1, np.float64)
+    lab2 = np.asarray(lab2, np.float64)
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    c_bar = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2
+    c_bar7 = c_bar ** 7
+    g = 0.5 * (1 - np.sqrt(c_bar7 / (c_bar7 + 25.0 ** 7)))
+    a1p = (1 + g) * a1
+    a2p = (1 + g) * a2
+    c1p = np.hypot(a1p, b1)
+    c2p = np.hypot(a2p, b2)
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+
+    chroma_product = c1p * c2p
+    dh = h2p - h1p
+    dh = np.where(dh > 180, dh - 360, np.where(dh < -180, dh + 360, dh))
+    dh = np.where(chroma_product == 0, 0, dh)
+
+    dL = L2 - L1
+    dC = c2p - c1p
+    dH = 2 * np.sqrt(chroma_product) * np.sin(np.radians(dh) / 2)
+
+    l_bar = (L1 + L2) / 2
+    cp_bar = (c1p + c2p) / 2
+    h_sum = h1p + h2p
+    h_bar = np.where(
+        np.abs(h1p - h2p) <= 180, h_sum / 2,
+        np.where(h_sum < 360, (h_sum + 360) / 2, (h_sum - 360) / 2),
+    )
+    h_bar = np.where(chroma_product == 0, h_sum, h_bar)
+
+    t = (1 - 0.17 * np.cos(np.radians(h_bar - 30)) + 0.24 * np.cos(np.radians(2 * h_bar))
+         + 0.32 * np.cos(np.radians(3 * h_bar + 6)) - 0.20 * np.cos(np.radians(4 * h_bar - 63)))
+    d_theta = 30 * np.exp(-(((h_bar - 275) / 25) ** 2))
+    cp_bar7 = cp_bar ** 7
+    r_c = 2 * np.sqrt(cp_bar7 / (cp_bar7 + 25.0 ** 7))
+    s_l = 1 + 0.015 * (l_bar - 50) ** 2 / np.sqrt(20 + (l_bar - 50) ** 2)
+    s_c = 1 + 0.045 * cp_bar
+    s_h = 1 + 0.015 * cp_bar * t
+    r_t = -np.sin(np.radians(2 * d_theta)) * r_c
+
+    dL, dC, dH = dL / s_l, dC / s_c, dH / s_h
+    return np.sqrt(np.maximum(dL ** 2 + dC ** 2 + dH ** 2 + r_t * dC * dH, 0))
+
+
+def nearest(colors, chunk=512):
+    """
+    Returns the vocabulary position closest to every RGB colour by CIEDE2000.
+    colors may be a single (r, g, b) or any (..., 3) array.
+    """
+    vocabulary = load_vocabulary()
+    colors = np.asarray(colors)
+    shape = colors.shape[:-1]
+    queries = rgb_to_cielab(colors.reshape(-1, 3))
+
+    result = np.empty(len(queries), np.intp)
+    for start in range(0, len(queries), chunk):
+        block = queries[start:start + chunk]
+        distances = ciede2000(block[:, None, :], vocabulary["lab"][None, :, :])
+        result[start:start + chunk] = np.argmin(distances, axis=1)
+    return result.reshape(shape)
+
+
+def name_colors(colors):
+    """ Returns the Colours.json name of every colour in an (N, 3) RGB array. """
+    names = load_vocabulary()["names"]
+    return [names[i] for i in nearest(np.asarray(colors).reshape(-1, 3))]
+
+
+def closest_name(rgb):
+    """ Returns the Colours.json name and hex code closest to one RGB colour. """
+    vocabulary = load_vocabulary()
+    position = int(nearest(rgb))
+    return vocabulary["names"][position], vocabulary["hex"][position]
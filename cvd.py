@@ -0,0 +1,127 @@
+""" Colour-vision-deficiency simulation and daltonization in linear RGB. """
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+import metrics
+
+MODES = ("protanopia", "deuteranopia", "tritanopia")
+
+# Machado, Oliveira and Fernandes (2009) simulation matrices at full severity, for linear RGB
+SIMULATION = {
+    "protanopia": [
+        [0.152286, 1.052583, -0.204868],
+        [0.114503, 0.786281, 0.099216],
+        [-0.003882, -0.048116, 1.051998],
+    ],
+    "deuteranopia": [
+        [0.367322, 0.860646, -0.227968],
+        [0.280085, 0.672501, 0.047413],
+        [-0.011820, 0.042940, 0.968881],
+    ],
+    "tritanopia": [
+        [1.255528, -0.076749, -0.178779],
+        [-0.078411, 0.930809, 0.147602],
+        [0.004733, 0.691367, 0.303900],
+    ],
+}
+
+# Fidaner et al. error-shift matrices: move the colour information the viewer
+# loses into channels they can still tell apart
+ERROR_SHIFT = {
+    "protanopia": [[0, 0, 0], [0.7, 1, 0], [0.7, 0, 1]],
+    "deuteranopia": [[0, 0, 0], [0.7, 1, 0], [0.7, 0, 1]],
+    "tritanopia": [[1, 0, 0.7], [0, 1, 0.7], [0, 0, 0]],
+}
+
+# Reverses RGB <-> BGR on both sides of a 3x3 matrix
+_FLIP = np.eye(3)[::-1]
+
+# 8-bit sRGB -> linear, and linear quantized to 12 bits -> 8-bit sRGB
+_LINEAR_STEPS = 4095
+
+# cv2.remap only takes maps smaller than this in both directions
+_REMAP_LIMIT = 32767
+
+
+def _srgb_to_linear(v):
+    return np.where(v <= 0.04045, v / 12.92, ((v + 0.055) / 1.055) ** 2.4)
+
+
+def _linear_to_srgb(v):
+    return np.where(v <= 0.0031308, v * 12.92, 1.055 * v ** (1 / 2.4) - 0.055)
+
+
+TO_LINEAR = _srgb_to_linear(np.arange(256) / 255.0).astype(np.float32)
+FROM_LINEAR = np.clip(np.rint(_linear_to_srgb(np.arange(_LINEAR_STEPS + 1) / _LINEAR_STEPS) * 255), 0, 255).astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def get_transform(mode, severity=1.0, operation="simulate"):
+    """
+    Returns the 3x3 matrix, in BGR order, that applies one operation in linear RGB.
+    Severity blends linearly between normal vision (0) and the full deficiency (1).
+    Both operations are linear in linear RGB, so one matrix covers the whole colour cube.
+    """
+    if mode not in SIMULATION:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {', '.join(MODES)}")
+    if not 0.0 <= severity <= 1.0:
+        raise ValueError("severity must be between 0 and 1")
+
+    identity = np.eye(3)
+    simulation = (1 - severity) * identity + severity * np.array(SIMULATION[mode])
+    if operation == "simulate":
+        matrix = simulation
+    elif operation == "daltonize":
+        # corrected = rgb + shift @ (rgb - simulated)
+        matrix = identity + np.array(ERROR_SHIFT[mode]) @ (identity - simulation)
+    else:
+        raise ValueError(f"Unknown operation {operation!r}")
+    return (_FLIP @ matrix @ _FLIP).astype(np.float32)
+
+
+def to_linear(image):
+    """ Converts an 8-bit BGR image to float32 linear RGB (still in BGR order). """
+    return cv2.LUT(image, TO_LINEAR)
+
+
+def from_linear(linear):
+    """ Converts float32 linear BGR back to 8-bit sRGB BGR. """
+    height, width = linear.shape[:2]
+    if width * 3 >= _REMAP_LIMIT or height >= _REMAP_LIMIT:
+        steps = np.clip(linear * _LINEAR_STEPS + 0.5, 0, _LINEAR_STEPS).astype(np.uint16)
+        return FROM_LINEAR[steps]
+
+    # cv2.remap over a 1-row image is a vectorized 1D table lookup on float indexes
+    steps = (linear * _LINEAR_STEPS).reshape(height, width * 3)
+    rows = np.zeros_like(steps)
+    srgb = cv2.remap(FROM_LINEAR.reshape(1, -1), steps, rows, cv2.INTER_NEAREST, borderMode=cv2.BORDER_REPLICATE)
+    return srgb.reshape(height, width, 3)
+
+
+@metrics.timed("cvd")
+def apply_linear(linear, mode, severity=1.0, operation="simulate"):
+    """ Applies one operation to an image already converted with to_linear. """
+    return from_linear(cv2.transform(linear, get_transform(mode, float(severity), operation)))
+
+
+def simulate(image, mode, severity=1.0):
+    """ Shows how an 8-bit BGR image looks to a viewer with the given deficiency. """
+    return apply_linear(to_linear(image), mode, severity, "simulate")
+
+
+def daltonize(image, mode, severity=1.0):
+    """ Recolours an 8-bit BGR image so a viewer with the given deficiency can tell its colours apart. """
+    return apply_linear(to_linear(image), mode, severity, "daltonize")
+
+
+def render_all(image, modes=MODES, severities=(1.0,), operations=("simulate", "daltonize")):
+    """ Renders every requested (mode, severity, operation) from one linearized copy of the image. """
+    linear = to_linear(image)
+    return {
+        (mode, severity, operation): apply_linear(linear, mode, severity, operation)
+        for mode in modes
+        for severity in severities
+        for operation in operations
+    }
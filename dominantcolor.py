@@ -0,0 +1,62 @@
+""" Dominant colour of an image with its name and mood. Importable; never opens a window. """
+import cv2
+
+import analysis
+import shadeindex
+
+
+# Function to find the closest color name
+def get_closest_color(rgb):
+    return shadeindex.nearest_name(shadeindex.get_index("names", metric="rgb"), rgb)
+
+
+def detect_dominant_color(image):
+    """ Returns the dominant colour of an image path, bytes or BGR array, or None if it cannot be loaded. """
+    image = analysis.load_image(image, cover=analysis.DOMINANT_SIZE)
+    if image is None:
+        return None
+    return analysis.dominant_color(image)
+
+
+def annotate(image, dominant):
+    """ Returns a 300x300 copy of a BGR image with the dominant colour written on it. """
+    image_resized = cv2.resize(image, analysis.DOMINANT_SIZE)
+    rgb = dominant["rgb"]
+
+    # Prepare Text
+    lines = [
+        f"Dominant Color: {dominant['name']}",
+        f"RGB({rgb[0]}, {rgb[1]}, {rgb[2]})",
+        f"HEX: {dominant['hex']}",
+        f"Mood: {dominant['mood']}",
+        f"Shade: {dominant['shade']}",
+    ]
+
+    # Draw a Background Box for Text
+    cv2.rectangle(image_resized, (5, 5), (280, 120), (0, 0, 0), -1)  # Black box for better visibility
+
+    # Write Text on Image
+    font_scale = 0.5
+    font_thickness = 1
+    text_color = (255, 255, 255)  # White text
+    for i, text in enumerate(lines):
+        cv2.putText(image_resized, text, (10, 20 + 20 * i), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, text_color, font_thickness)
+    return image_resized
+
+
+def show_dominant_color(image_path):
+    """ Shows an image with its dominant colour written on it. """
+    image = analysis.load_image(image_path, cover=analysis.DOMINANT_SIZE)
+    if image is None:
+        print("Error: Could not load image.")
+        return
+
+    annotated = annotate(image, analysis.dominant_color(image))
+    cv2.imshow("Dominant Color", annotated)
+    cv2.waitKey(0)
+    cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    show_dominant_color("images/test5.jpg")  # Change this to your image path
@@ -0,0 +1,147 @@
+""" The enhance_*_weak filters fused into as few full-image passes as possible. """
+import cv2
+import numpy as np
+
+import metrics
+
+# What each colour-weak filter does, in the order the original filters do it:
+# shift one LAB channel, equalize L, then paint the family's HSV ranges with a
+# colour that is easier to see
+FILTERS = {
+    "red": {
+        "channel": 1, "shift": 30,
+        "ranges": [((0, 40, 40), (10, 255, 255)), ((170, 40, 40), (180, 255, 255))],
+        "replacement": (0, 165, 255),  # Orange
+    },
+    "green": {
+        "channel": 1, "shift": -30,
+        "ranges": [((35, 40, 40), (85, 255, 255))],
+        "replacement": (255, 255, 0),  # Cyan
+    },
+    "blue": {
+        "channel": 2, "shift": 20,
+        "ranges": [((100, 40, 40), (140, 255, 255))],
+        "replacement": (128, 0, 128),  # Purple
+    },
+}
+
+
+def _shift_channel(lab, spec):
+    channel = lab[..., spec["channel"]]
+    if spec["shift"] >= 0:
+        lab[..., spec["channel"]] = cv2.add(channel, spec["shift"]).reshape(channel.shape)
+    else:
+        lab[..., spec["channel"]] = cv2.subtract(channel, -spec["shift"]).reshape(channel.shape)
+
+
+def _paint(image, spec):
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    mask = np.zeros(hsv.shape[:2], np.uint8)
+    for lower, upper in spec["ranges"]:
+        mask |= cv2.inRange(hsv, np.array(lower), np.array(upper))
+    image[mask > 0] = spec["replacement"]
+
+
+def equalize_lut(hist):
+    """ The table cv2.equalizeHist builds from a 256-bin histogram. """
+    hist = np.asarray(hist, np.float64)
+    nonzero = np.nonzero(hist)[0]
+    lut = np.zeros(256, np.uint8)
+    if len(nonzero) == 0:
+        return lut
+    first = nonzero[0]
+    total = hist.sum()
+    if total == hist[first]:
+        lut[:] = first
+        return lut
+    scale = 255.0 / (total - hist[first])
+    cdf = np.cumsum(hist) - hist[first]
+    lut[first:] = np.clip(np.rint(cdf[first:] * scale), 0, 255).astype(np.uint8)
+    return lut
+
+
+def enhance_reference(image, family):
+    """ The original step-by-step filter, kept to check the fused version against. """
+    spec = FILTERS[family]
+    lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+    _shift_channel(lab, spec)
+    lab[..., 0] = cv2.equalizeHist(np.ascontiguousarray(lab[..., 0]))
+    enhanced = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
+    _paint(enhanced, spec)
+    edges = cv2.Canny(enhanced, 100, 200)
+    enhanced[edges > 0] = [0, 0, 0]
+    return enhanced
+
+
+def build_lut(l_hist, family):
+    """
+    Compiles the per-pixel part of a filter before painting into one 256x3 table:
+    L is equalized with the image's histogram, the shifted channel saturates like
+    cv2.add / cv2.subtract and the third channel passes through.
+    """
+    spec = FILTERS[family]
+    values = np.arange(256)
+    lut = np.repeat(values.astype(np.uint8)[:, None], 3, axis=1)
+    lut[:, 0] = equalize_lut(l_hist)
+    lut[:, spec["channel"]] = np.clip(values + spec["shift"], 0, 255)
+    return lut.reshape(1, 256, 3)
+
+
+def _edge_mask(image, edge_height):
+    """ Canny edges of the filtered image, optionally found at preview resolution and scaled up. """
+    height, width = image.shape[:2]
+    if edge_height is None or height <= edge_height:
+        return cv2.Canny(image, 100, 200)
+    scale = edge_height / height
+    small = cv2.resize(image, (max(1, round(width * scale)), edge_height), interpolation=cv2.INTER_AREA)
+    edges = cv2.Canny(small, 100, 200)
+    return cv2.resize(edges, (width, height), interpolation=cv2.INTER_NEAREST)
+
+
+def enhance(image, family, edge_height=None):
+    """
+    Applies a colour-weak filter with the same result as enhance_reference.
+    The LAB shift and equalization run as one table pass, and painting writes
+    through masks in place, so no split channels or boolean copies are made.
+    With edge_height set, the edge overlay is computed at that height instead
+    of at full resolution, which is much cheaper on large photos.
+    """
+    lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+    l_hist = cv2.calcHist([lab], [0], None, [256], [0, 256]).ravel()
+    return _enhance_lab(lab, family, build_lut(l_hist, family), edge_height)
+
+
+def enhance_with_lut(image, family, lut, edge_height=None):
+    """ Like enhance, with a table from build_lut; used when the L histogram comes from a larger image. """
+    return _enhance_lab(cv2.cvtColor(image, cv2.COLOR_BGR2LAB), family, lut, edge_height)
+
+
+@metrics.timed("filter")
+def _enhance_lab(lab, family, lut, edge_height):
+    spec = FILTERS[family]
+    cv2.LUT(lab, lut, dst=lab)
+    enhanced = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
+    del lab
+
+    hsv = cv2.cvtColor(enhanced, cv2.COLOR_BGR2HSV)
+    mask = np.zeros(hsv.shape[:2], np.uint8)
+    for lower, upper in spec["ranges"]:
+        cv2.bitwise_or(mask, cv2.inRange(hsv, np.array(lower), np.array(upper)), dst=mask)
+    del hsv
+
+    _fill(enhanced, mask, spec["replacement"])
+    del mask
+
+    _fill(enhanced, _edge_mask(enhanced, edge_height), (0, 0, 0))
+    return enhanced
+
+
+def _fill(image, mask, color):
+    """ Sets the masked pixels of a BGR image to color, in place: clears them, then adds the colour. """
+    if image.shape[:2] == (1, 1):
+        # cv2 would take a one-pixel image for a Scalar
+        image[mask > 0] = color
+        return
+    cv2.bitwise_and(image, 0, dst=image, mask=mask)
+    if any(color):
+        cv2.add(image, tuple(color) + (0,), dst=image, mask=mask)
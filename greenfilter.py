@@ -1,40 +1,28 @@
 import cv2
-import numpy as np
+
+import fusedfilter
+
+def enhance_green_weak_image(img, edge_height=None):
+    """
+    Returns the green-weak enhanced version of a BGR image without saving or showing it.
+    See fusedfilter.FILTERS["green"] for the steps; edge_height computes the edge overlay
+    at preview resolution.
+    """
+    return fusedfilter.enhance(img, "green", edge_height)
 
 def enhance_green_weak(image_path, output_path="enhanced_green.png"):
+    """ Enhances an image file for green-weak vision, saves it and returns it. """
     # Load the image
     img = cv2.imread(image_path)
     if img is None:
         print("Error: Could not load image.")
-        return
-    
-    # Convert to LAB color space
-    lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
-    L, A, B = cv2.split(lab)
-
-    # 🌟 Boost green tones (reduce A channel for green shift)
-    A = cv2.subtract(A, 30)  # Increase green intensity
-    
-    # 🌟 Boost contrast using histogram equalization
-    L = cv2.equalizeHist(L)
-    
-    # Merge adjusted channels
-    enhanced_lab = cv2.merge([L, A, B])
-    enhanced_img = cv2.cvtColor(enhanced_lab, cv2.COLOR_LAB2BGR)
-
-    # 🌟 Shift green tones to cyan or yellow for better visibility
-    hsv = cv2.cvtColor(enhanced_img, cv2.COLOR_BGR2HSV)
-    lower_green = np.array([35, 40, 40])
-    upper_green = np.array([85, 255, 255])
-    mask = cv2.inRange(hsv, lower_green, upper_green)
+        return None
 
-    # Replace green with cyan (BGR for cyan = [255, 255, 0])
-    enhanced_img[mask > 0] = [255, 255, 0]
-
-    # 🌟 Add edge highlighting for better object separation
-    edges = cv2.Canny(enhanced_img, 100, 200)
-    enhanced_img[edges > 0] = [0, 0, 0]  # Black edges
+    enhanced_img = enhance_green_weak_image(img)
+    cv2.imwrite(output_path, enhanced_img)
+    return enhanced_img
 
+def show_enhanced(enhanced_img, title):
     # Resize the image for display
     height, width = enhanced_img.shape[:2]
     max_height = 500
@@ -44,12 +32,13 @@ def enhance_green_weak(image_path, output_path="enhanced_green.png"):
     else:
         enhanced_img_resized = enhanced_img
 
-    # Save and display result
-    cv2.imwrite(output_path, enhanced_img)
-    cv2.imshow("Enhanced for Green-weak Vision", enhanced_img_resized)
+    cv2.imshow(title, enhanced_img_resized)
     cv2.waitKey(0)
     cv2.destroyAllWindows()
 
-# Example usage
-image_path = "images/fruits.jpg"
-enhance_green_weak(image_path)
+if __name__ == "__main__":
+    # Example usage
+    image_path = "images/fruits.jpg"
+    enhanced_img = enhance_green_weak(image_path)
+    if enhanced_img is not None:
+        show_enhanced(enhanced_img, "Enhanced for Green-weak Vision")
@@ -0,0 +1,117 @@
+""" Hover read-outs for the identification viewers, answered from tables built once per image. """
+import cv2
+import numpy as np
+
+import analysis
+import shadeindex
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+FONT_SCALE = 0.6
+TEXT_OUTLINE = 3
+
+
+def build_viewer(window, output_image, original_image, contours, family,
+                 highlight_color=(255, 0, 255), highlight_thickness=3, show_shade_hex=False):
+    """
+    Precomputes everything a hover needs: a region label map, the closest shade of
+    every pixel inside a region and each region's bounding box. show_shade_hex shows
+    the matched shade's hex code instead of the pixel's.
+    Returns the viewer state passed to on_mouse as the callback param.
+    """
+    labels = analysis.region_labels(contours, original_image.shape)
+
+    # Closest shade of every pixel inside a region, in one call
+    index = shadeindex.get_index(family, metric="rgb")
+    shades = np.full(labels.shape, -1, np.int16)
+    inside = labels > 0
+    if inside.any():
+        shades[inside] = shadeindex.nearest(index, original_image[inside][:, ::-1])
+
+    pad = highlight_thickness
+    boxes = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        boxes.append((x - pad, y - pad, x + w + pad, y + h + pad))
+
+    return {
+        "window": window,
+        "base": output_image,
+        "canvas": output_image.copy(),
+        "original": original_image,
+        "contours": contours,
+        "labels": labels,
+        "shades": shades,
+        "boxes": boxes,
+        "index": index,
+        "highlight": (highlight_color, highlight_thickness),
+        "show_shade_hex": show_shade_hex,
+        "dirty": None,  # (x0, y0, x1, y1) of the canvas that differs from base
+        "last": None,
+    }
+
+
+def _clip(rect, shape):
+    x0, y0, x1, y1 = rect
+    height, width = shape[:2]
+    return max(x0, 0), max(y0, 0), min(x1, width), min(y1, height)
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    return min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])
+
+
+def _text_rect(text, origin):
+    (w, h), baseline = cv2.getTextSize(text, FONT, FONT_SCALE, TEXT_OUTLINE)
+    x, y = origin
+    return x - TEXT_OUTLINE, y - h - TEXT_OUTLINE, x + w + TEXT_OUTLINE, y + baseline + TEXT_OUTLINE
+
+
+def _draw_labels(canvas, labels):
+    """ Black outlines for every label first, then the yellow fill, as the viewers always drew them. """
+    for text, origin in labels:
+        cv2.putText(canvas, text, origin, FONT, FONT_SCALE, (0, 0, 0), TEXT_OUTLINE, cv2.LINE_AA)
+    for text, origin in labels:
+        cv2.putText(canvas, text, origin, FONT, FONT_SCALE, (255, 255, 0), 1, cv2.LINE_AA)
+
+
+def on_mouse(event, x, y, flags, viewer):
+    """ Mouse callback: names the shade under the cursor and outlines its region. """
+    if event != cv2.EVENT_MOUSEMOVE:
+        return
+    labels = viewer["labels"]
+    if not (0 <= y < labels.shape[0] and 0 <= x < labels.shape[1]):
+        return
+
+    region = labels[y, x] - 1
+    key = (x, y) if region >= 0 else None
+    if key == viewer["last"]:
+        return  # Nothing to redraw
+    viewer["last"] = key
+
+    canvas, base = viewer["canvas"], viewer["base"]
+    if viewer["dirty"] is not None:
+        x0, y0, x1, y1 = viewer["dirty"]
+        canvas[y0:y1, x0:x1] = base[y0:y1, x0:x1]
+        viewer["dirty"] = None
+
+    if region >= 0:
+        index = viewer["index"]
+        shade = viewer["shades"][y, x]
+        name = index["names"][shade]
+        if viewer["show_shade_hex"]:
+            hex_code = "#{:02x}{:02x}{:02x}".format(*(int(c) for c in index["rgb"][shade]))
+        else:
+            b, g, r = viewer["original"][y, x]
+            hex_code = f"#{r:02x}{g:02x}{b:02x}"
+
+        color, thickness = viewer["highlight"]
+        cv2.drawContours(canvas, viewer["contours"], int(region), color, thickness)
+        text_position, hex_position = (x + 10, y - 10), (x + 10, y + 10)
+        _draw_labels(canvas, [(name, text_position), (hex_code, hex_position)])
+
+        dirty = _union(viewer["boxes"][region], _text_rect(name, text_position))
+        viewer["dirty"] = _clip(_union(dirty, _text_rect(hex_code, hex_position)), canvas.shape)
+
+    cv2.imshow(viewer["window"], canvas)
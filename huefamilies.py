@@ -0,0 +1,131 @@
+""" Declarative hue families and a detector that classifies all of them in one pass. """
+import cv2
+import numpy as np
+
+import colordata
+import shadeindex
+
+# Each family is described by data only:
+#   bands            inclusive OpenCV hue ranges (0-179)
+#   min_saturation,
+#   min_value        floors below which a pixel is too grey or dark to belong to any hue
+#   shades, moods,
+#   uses             {name: (r, g, b)}, {name: mood} and {name: uses} tables
+#   preview          how the hover viewers threshold their 500x500 preview: HSV ranges
+#                    on the raw or denoised preview, or a threshold on one LAB channel
+#   canny            hysteresis thresholds used to outline preview regions
+#   min_region_area  outlines smaller than this are dropped (None keeps all)
+SPECS = {
+    "red": {
+        "bands": [(0, 10), (170, 180)],
+        "min_saturation": 50, "min_value": 50,
+        "shades": colordata.RED_SHADES, "moods": colordata.RED_MOODS, "uses": colordata.RED_USES,
+        "preview": {"plane": "preview_denoised_lab", "channel": 1, "above": 150},
+        "canny": (30, 100), "min_region_area": 100,
+    },
+    "green": {
+        "bands": [(35, 90)],
+        "min_saturation": 50, "min_value": 50,
+        "shades": colordata.GREEN_SHADES, "moods": colordata.GREEN_MOODS, "uses": colordata.GREEN_USES,
+        "preview": {"plane": "preview_hsv", "ranges": [((35, 40, 40), (90, 255, 255))]},
+        "canny": (50, 150), "min_region_area": 100,
+    },
+    "blue": {
+        "bands": [(90, 140)],
+        "min_saturation": 50, "min_value": 50,
+        "shades": colordata.BLUE_SHADES, "moods": colordata.BLUE_MOODS, "uses": colordata.BLUE_USES,
+        "preview": {"plane": "preview_denoised_hsv", "ranges": [((90, 50, 50), (130, 255, 255))]},
+        "canny": (30, 100), "min_region_area": None,
+    },
+}
+
+# Bit i of a classification mask is set when a pixel belongs to the i-th family of ORDER
+ORDER = list(SPECS)
+
+_tables = {}
+
+
+def register_family(name, bands, shades, moods=None, uses=None, min_saturation=50, min_value=50, **options):
+    """
+    Adds a hue family, e.g. register_family("yellow", [(20, 34)], YELLOW_SHADES).
+    Its preview defaults to its own bands on the denoised preview.
+    """
+    spec = {
+        "bands": list(bands),
+        "min_saturation": min_saturation, "min_value": min_value,
+        "shades": shades, "moods": moods or {}, "uses": uses or {},
+        "canny": (30, 100), "min_region_area": 100,
+    }
+    spec["preview"] = {"plane": "preview_denoised_hsv", "ranges": detection_ranges(spec)}
+    spec.update(options)
+    SPECS[name] = spec
+    if name not in ORDER:
+        ORDER.append(name)
+    shadeindex.PALETTES[name] = shades
+    _tables.clear()
+
+
+def detection_ranges(spec):
+    """ A spec's bands as cv2.inRange (lower, upper) HSV pairs. """
+    return [((low, spec["min_saturation"], spec["min_value"]), (high, 255, 255)) for low, high in spec["bands"]]
+
+
+def get_tables():
+    """
+    Compiles every spec into per-hue bitmask tables, one per distinct saturation/value
+    floor: tables[(s, v)][h] has bit i set when hue h is in family ORDER[i]'s bands.
+    """
+    if not _tables:
+        if len(ORDER) > 32:
+            raise ValueError("At most 32 families can be classified at once")
+        dtype = np.uint8 if len(ORDER) <= 8 else np.uint16 if len(ORDER) <= 16 else np.uint32
+        for bit, name in enumerate(ORDER):
+            spec = SPECS[name]
+            floors = (spec["min_saturation"], spec["min_value"])
+            table = _tables.setdefault(floors, np.zeros(256, dtype))
+            for low, high in spec["bands"]:
+                table[low:high + 1] |= dtype(1 << bit)
+    return _tables
+
+
+def classify(hsv):
+    """
+    Classifies every pixel of an HSV image into all families at once. Returns the
+    multi-label mask: an integer image whose bit i is set for family ORDER[i].
+    """
+    hue = hsv[..., 0]
+    bits = None
+    for (min_saturation, min_value), table in get_tables().items():
+        floor = cv2.inRange(hsv, (0, min_saturation, min_value), (255, 255, 255))
+        if table.dtype == np.uint8:
+            labels = cv2.bitwise_and(cv2.LUT(hue, table), floor)
+        else:
+            labels = np.where(floor > 0, table[hue], 0).astype(table.dtype)
+        bits = labels if bits is None else bits | labels
+    return bits
+
+
+def mask(bits, family):
+    """ One family's 0/255 mask out of a classify result. """
+    bit = 1 << ORDER.index(family)
+    # No cv2 array-with-number calls here: they take a 1x1 image for a Scalar
+    if bits.dtype == np.uint8:
+        return cv2.threshold(np.bitwise_and(bits, bit), 0, 255, cv2.THRESH_BINARY)[1]
+    return np.where(bits & bit, 255, 0).astype(np.uint8)
+
+
+def first_family(bits, families):
+    """ 0 where no family of the list matches, else 1 + the position of the first one that does. """
+    positions = [ORDER.index(family) for family in families]
+    if bits.dtype == np.uint8:
+        table = np.zeros(256, np.uint8)
+        for value in range(256):
+            for i, position in enumerate(positions):
+                if value & (1 << position):
+                    table[value] = i + 1
+                    break
+        return cv2.LUT(bits, table)
+    result = np.zeros(bits.shape, np.uint8)
+    for i in reversed(range(len(positions))):
+        result[(bits & (1 << positions[i])) != 0] = i + 1
+    return result
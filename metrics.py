@@ -0,0 +1,134 @@
+""" Timing spans and counters for the hot paths, with pluggable sinks. Off until enable() is called. """
+import functools
+import logging
+import threading
+import time
+
+PREFIX = "colorsense"
+
+_enabled = False
+_sinks = []
+_lock = threading.Lock()
+_spans = {}  # name -> [calls, total seconds, slowest seconds]
+_counters = {}
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def enable(*sinks):
+    """ Starts recording; every finished span is also passed to each sink as sink(name, seconds). """
+    global _enabled
+    _sinks[:] = sinks
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    _sinks[:] = []
+
+
+def enabled():
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def span(name):
+    """ Context manager timing one stage. A shared no-op object while metrics are off. """
+    return _Span(name) if _enabled else _NULL_SPAN
+
+
+def timed(name):
+    """ Decorator timing every call of a function as a span. """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _Span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record(name, seconds):
+    with _lock:
+        stats = _spans.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+    for sink in _sinks:
+        sink(name, seconds)
+
+
+def count(name, value=1):
+    """ Adds to a counter such as regions found or pixels classified. """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def snapshot():
+    """ The spans (calls, total and slowest seconds) and counters recorded so far. """
+    with _lock:
+        return {
+            "spans": {name: {"calls": c, "seconds": s, "max_seconds": m} for name, (c, s, m) in _spans.items()},
+            "counters": dict(_counters),
+        }
+
+
+def log_sink(logger=None, level=logging.INFO):
+    """ A sink writing one log line per finished span. """
+    logger = logger or logging.getLogger(PREFIX + ".metrics")
+
+    def sink(name, seconds):
+        logger.log(level, "span %s %.2f ms", name, seconds * 1000)
+    return sink
+
+
+def prometheus_text(extra_gauges=None):
+    """ Everything recorded so far in the Prometheus text exposition format. """
+    data = snapshot()
+    lines = [
+        f"# TYPE {PREFIX}_span_seconds_total counter",
+        *(f'{PREFIX}_span_seconds_total{{span="{name}"}} {s["seconds"]:.6f}' for name, s in sorted(data["spans"].items())),
+        f"# TYPE {PREFIX}_span_calls_total counter",
+        *(f'{PREFIX}_span_calls_total{{span="{name}"}} {s["calls"]}' for name, s in sorted(data["spans"].items())),
+        f"# TYPE {PREFIX}_span_max_seconds gauge",
+        *(f'{PREFIX}_span_max_seconds{{span="{name}"}} {s["max_seconds"]:.6f}' for name, s in sorted(data["spans"].items())),
+    ]
+    for name, value in sorted(data["counters"].items()):
+        lines += [f"# TYPE {PREFIX}_{name}_total counter", f"{PREFIX}_{name}_total {value}"]
+    for name, value in sorted((extra_gauges or {}).items()):
+        lines += [f"# TYPE {PREFIX}_{name} gauge", f"{PREFIX}_{name} {value}"]
+    return "\n".join(lines) + "\n"
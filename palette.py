@@ -0,0 +1,80 @@
+""" Dominant colour palette from a quantized colour histogram. """
+import numpy as np
+
+import metrics
+import shadeindex
+
+# Bits kept per channel when binning pixels (16 levels -> 4096 bins)
+HISTOGRAM_BITS = 4
+
+# Bins closer than this LAB distance to a peak are merged into it
+MERGE_DISTANCE = 25.0
+
+
+def color_histogram(image, bits=HISTOGRAM_BITS, bgr=True):
+    """
+    Bins every pixel of an 8-bit colour image into a 3D RGB histogram.
+    Returns the pixel count and the mean RGB colour of every occupied bin.
+    """
+    _, counts, means = binned_histogram(image, bits, bgr)
+    return counts, means
+
+
+def binned_histogram(image, bits=HISTOGRAM_BITS, bgr=True):
+    """ Like color_histogram, also returning the ids (r << 2b | g << b | b) of the occupied bins. """
+    pixels = np.asarray(image).reshape(-1, 3)
+    if bgr:
+        pixels = pixels[:, ::-1]
+
+    shift = 8 - bits
+    cells = (pixels[:, 0] >> shift).astype(np.int32) << (2 * bits)
+    cells |= (pixels[:, 1] >> shift).astype(np.int32) << bits
+    cells |= (pixels[:, 2] >> shift).astype(np.int32)
+
+    size = 1 << (3 * bits)
+    counts = np.bincount(cells, minlength=size)
+    sums = np.stack([np.bincount(cells, weights=pixels[:, c], minlength=size) for c in range(3)], axis=1)
+
+    occupied = np.nonzero(counts)[0]
+    return occupied, counts[occupied], sums[occupied] / counts[occupied, None]
+
+
+def palette_from_histogram(counts, means, k=5, merge_distance=MERGE_DISTANCE):
+    """
+    Picks up to k peaks from a colour histogram, most populated first.
+    Every bin within merge_distance of a peak is merged into it, so each
+    colour is the mean of one real cluster rather than of the whole image.
+    """
+    total = counts.sum()
+    if total == 0:
+        return []
+
+    lab = shadeindex.rgb_to_lab(means)
+    available = np.ones(len(counts), bool)
+    peaks = []
+    for _ in range(k):
+        if not available.any():
+            break
+        peak = int(np.argmax(np.where(available, counts, -1)))
+        near = available & (np.linalg.norm(lab - lab[peak], axis=1) <= merge_distance)
+        peaks.append(near)
+        available &= ~near
+
+    # Shares count every pixel once, against the closest peak
+    centres = [(means[near] * counts[near, None]).sum(axis=0) / counts[near].sum() for near in peaks]
+    centres_lab = shadeindex.rgb_to_lab(np.array(centres))
+    closest = np.argmin(np.linalg.norm(lab[:, None] - centres_lab[None], axis=2), axis=1)
+    shares = np.bincount(closest, weights=counts, minlength=len(peaks)) / total
+
+    colors = [
+        {"rgb": tuple(int(round(v)) for v in centre), "share": float(share)}
+        for centre, share in zip(centres, shares)
+    ]
+    return sorted(colors, key=lambda color: -color["share"])
+
+
+@metrics.timed("palette")
+def extract_palette(image, k=5, bgr=True):
+    """ Returns the k dominant colours of an image with the share of pixels each one covers. """
+    counts, means = color_histogram(image, bgr=bgr)
+    return palette_from_histogram(counts, means, k)
@@ -0,0 +1,60 @@
+""" Statistics for every connected region of a mask, measured inside each region's own bounding box. """
+import cv2
+import numpy as np
+
+import metrics
+import shadeindex
+
+
+@metrics.timed("region_stats")
+def region_stats(image, mask, min_area=1, connectivity=8, with_labels=False):
+    """
+    Finds the connected regions of a 0/255 mask and measures each on its own pixels of a
+    BGR image. Returns a dict of per-region arrays, one row per region with at least
+    min_area pixels: label, area, bbox (x, y, w, h), centroid (x, y), mean_rgb, mean_lab
+    (LAB of mean_rgb, 8-bit scaled like shadeindex) and var_rgb (per-channel variance).
+    With with_labels, "labels" is an int32 map of the kept regions (0 elsewhere).
+
+    Every region lies within one external outline, so regions are labelled outline by
+    outline, and only in outlines whose bounding box could hold min_area pixels. Each
+    region is then measured inside its own box, so the cost follows the size of the kept
+    regions rather than the whole image, however many regions one outline holds.
+    """
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    boxes = np.array([cv2.boundingRect(contour) for contour in contours], np.int32).reshape(-1, 4)
+    labels = np.zeros(mask.shape[:2], np.int32) if with_labels else None
+
+    rows = []
+    for i in np.flatnonzero(boxes[:, 2] * boxes[:, 3] >= min_area):
+        x, y, w, h = (int(v) for v in boxes[i])
+        # The outline filled, holes included, keeps the regions nested in it and drops its neighbours'
+        inside = np.zeros((h, w), np.uint8)
+        cv2.drawContours(inside, [contours[i]], 0, 255, cv2.FILLED, offset=(-x, -y))
+        inside &= mask[y:y + h, x:x + w]
+        if cv2.countNonZero(inside) < min_area:
+            continue
+        count, parts, part_stats, centroids = cv2.connectedComponentsWithStats(inside, connectivity=connectivity)
+        crop = image[y:y + h, x:x + w]
+        for j in np.flatnonzero(part_stats[1:, cv2.CC_STAT_AREA] >= min_area) + 1:
+            # Each part is compared and measured within its own box, not the whole outline's
+            px, py, pw, ph, area = (int(v) for v in part_stats[j])
+            own = (parts[py:py + ph, px:px + pw] == j).view(np.uint8)
+            mean, std = cv2.meanStdDev(crop[py:py + ph, px:px + pw], mask=own)
+            x0, y0 = x + px, y + py
+            rows.append(((x0, y0, pw, ph), area, centroids[j] + (x, y), mean.ravel()[::-1], std.ravel()[::-1] ** 2))
+            if with_labels:
+                labels[y0:y0 + ph, x0:x0 + pw][own > 0] = len(rows)
+
+    mean = np.array([row[3] for row in rows], np.float64).reshape(-1, 3)
+    stats = {
+        "label": np.arange(1, len(rows) + 1),
+        "area": np.array([row[1] for row in rows], np.int64),
+        "bbox": np.array([row[0] for row in rows], np.int32).reshape(-1, 4),
+        "centroid": np.array([row[2] for row in rows], np.float64).reshape(-1, 2),
+        "mean_rgb": mean,
+        "mean_lab": shadeindex.rgb_to_lab(mean) if len(rows) else np.zeros((0, 3), np.float32),
+        "var_rgb": np.array([row[4] for row in rows], np.float64).reshape(-1, 3),
+    }
+    if with_labels:
+        stats["labels"] = labels
+    return stats
@@ -0,0 +1,365 @@
+""" Local analysis service behind the /upload endpoint the upload pages call. """
+import base64
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+from flask import Flask, Response, jsonify, request
+
+import analysis
+import bluefilter
+import cache
+import colorbase
+import colornames
+import cvd
+import greenfilter
+import metrics
+import redfilter
+import sessions
+import shadeindex
+import shademap
+
+# Colour-blindness mode -> filter that makes it easier to see
+FILTERS = {
+    "protanopia": redfilter.enhance_red_weak_image,
+    "deuteranopia": greenfilter.enhance_green_weak_image,
+    "tritanopia": bluefilter.enhance_blue_weak_image,
+}
+
+MAX_WORKERS = os.cpu_count() or 4
+PREVIEW_HEIGHT = 500
+CACHE_DIR = cache.default_directory()
+
+# Size the first streamed answer's palette is taken from
+THUMBNAIL_SIZE = (96, 96)
+
+# Uploads being analysed at once; beyond this new ones get 503 and a Retry-After hint
+MAX_PENDING = MAX_WORKERS * 4
+RETRY_AFTER_SECONDS = 1
+
+app = Flask(__name__)
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+results = cache.ResultCache(CACHE_DIR)
+admission = threading.BoundedSemaphore(MAX_PENDING)
+open_sessions = sessions.SessionStore()
+
+
+def warm_up():
+    """ Loads the colour tables and compiles the indexes before the first request. """
+    colorbase.install()
+    for palette in shadeindex.PALETTES:
+        shadeindex.get_index(palette, metric="rgb")
+        shadeindex.get_index(palette, metric="lab")
+    shademap.get_table()
+    colornames.load_vocabulary()
+
+
+def preview(image):
+    """ Downscales an image to the preview height. """
+    return sessions.preview(image, PREVIEW_HEIGHT)
+
+
+@metrics.timed("png_encode")
+def encode_preview(image):
+    """ Downscales an image to the preview height and returns it as a PNG data URL. """
+    _, png = cv2.imencode(".png", preview(image))
+    return "data:image/png;base64," + base64.b64encode(png.tobytes()).decode("ascii")
+
+
+def render_cvd(image, mode, severity):
+    """ Returns the simulated and daltonized previews for one mode as PNG data URLs. """
+    renders = cvd.render_all(preview(image), modes=(mode,), severities=(severity,))
+    return {
+        "simulated_image": encode_preview(renders[(mode, severity, "simulate")]),
+        "daltonized_image": encode_preview(renders[(mode, severity, "daltonize")]),
+    }
+
+
+def detect(image):
+    return analysis.summarize(analysis.analyze(image))
+
+
+def coverage(image):
+    return shademap.summarize(shademap.shade_map(preview(image)))
+
+
+def filter_preview(image, mode):
+    """ The mode's colour-weak filter as a PNG data URL, run on the preview like Session.render. """
+    return encode_preview(FILTERS[mode](preview(image)))
+
+
+def summary(dominant, families, shades):
+    return {
+        "average_color": f"{dominant['name']} ({dominant['hex']})",
+        "dominant": dominant,
+        "families": families,
+        "coverage": shades,
+    }
+
+
+def report(image, mode=None, severity=1.0, digest=None):
+    """
+    Runs detection, dominant colour and the mode's filters side by side on the worker pool.
+    With the image's content digest, each part is taken from the result cache when it can be,
+    so switching modes on the same photo only renders what is new.
+    """
+    def submit(name, compute, *args):
+        if digest is None:
+            return executor.submit(compute, image, *args)
+        return executor.submit(results.get_or_compute, cache.make_key(digest, name, *args), compute, image, *args)
+
+    detection = submit("families", detect)
+    dominant = submit("dominant", analysis.dominant_color)
+    shades = submit("coverage", coverage)
+    filtered = submit("filtered", filter_preview, mode) if mode in FILTERS else None
+    simulated = submit("cvd", render_cvd, mode, severity) if mode in cvd.MODES else None
+
+    colors = summary(dominant.result(), detection.result(), shades.result())
+    if filtered is not None:
+        colors["filtered_image"] = filtered.result()
+    if simulated is not None:
+        colors.update(simulated.result())
+    return {"colors": colors}
+
+
+def open_session(image, digest):
+    """
+    Analyses an image once and keeps it as a session. The dominant colour and coverage
+    run on the pool while the session builds its planes and region tables.
+    """
+    dominant = executor.submit(results.get_or_compute, cache.make_key(digest, "dominant"), analysis.dominant_color, image)
+    shades = executor.submit(results.get_or_compute, cache.make_key(digest, "coverage"), coverage, image)
+    session = open_sessions.add(sessions.Session(image, digest, PREVIEW_HEIGHT))
+    return session, summary(dominant.result(), analysis.summarize(session.regions), shades.result())
+
+
+def render_key(session, mode, severity):
+    return cache.make_key(session.digest, "session_render", mode, severity)
+
+
+def render_session(session, mode, severity):
+    """ A session's filtered, simulated and daltonized previews for one mode, as PNG data URLs. """
+    def render():
+        return {name: encode_preview(image) for name, image in session.render(mode, severity).items()}
+    return results.get_or_compute(render_key(session, mode, severity), render)
+
+
+def read_severity(form):
+    """ The severity field of a request as a float in [0, 1]; raises ValueError with a message for the client. """
+    try:
+        severity = float(form.get("severity", 1.0))
+    except ValueError:
+        raise ValueError("severity must be a number.") from None
+    if not 0.0 <= severity <= 1.0:
+        raise ValueError("severity must be between 0 and 1.")
+    return severity
+
+
+def busy():
+    metrics.count("uploads_rejected")
+    response = jsonify({"error": "Server busy, please retry."})
+    response.headers["Retry-After"] = str(RETRY_AFTER_SECONDS)
+    return response, 503
+
+
+def progressive_report(data, mode=None, severity=1.0, digest=None):
+    """
+    Yields (stage, colors) as each step of the analysis finishes, coarse to fine:
+    "thumbnail", the dominant colour and palette of a tiny thumbnail; "preview", the
+    family coverage and region outlines at preview resolution; "full", the same report
+    /upload returns, with full-resolution detection and the mode's renders. The first
+    two steps work on one reduced JPEG decode. Raises ValueError if the image cannot be
+    decoded.
+    """
+    reduced = analysis.load_image(data, cover=analysis.PREVIEW_SIZE)
+    if reduced is None:
+        raise ValueError("Could not decode image.")
+    dominant = analysis.dominant_color(reduced, size=THUMBNAIL_SIZE)
+    yield "thumbnail", {"dominant": dominant, "average_color": f"{dominant['name']} ({dominant['hex']})"}
+
+    planes = analysis.build_planes(reduced)
+    yield "preview", {
+        "coverage": coverage(reduced),
+        "outline_size": analysis.PREVIEW_SIZE,
+        "outlines": {family: analysis.region_outlines(analysis.find_regions(planes, family))
+                     for family in analysis.FAMILIES},
+    }
+    del planes, reduced
+
+    result = report(analysis.load_image(data), mode, severity, digest)
+    results.put(cache.make_key(digest, "report", mode, severity), result)
+    yield "full", result["colors"]
+
+
+def stream_events(stages, sse=False):
+    """ Formats (stage, colors) pairs as NDJSON lines, or as Server-Sent Events. """
+    try:
+        for stage, colors in stages:
+            body = json.dumps({"stage": stage, "colors": colors})
+            yield f"event: {stage}\ndata: {body}\n\n" if sse else body + "\n"
+    except ValueError as error:
+        body = json.dumps({"stage": "error", "error": str(error)})
+        yield f"event: error\ndata: {body}\n\n" if sse else body + "\n"
+
+
+@app.after_request
+def allow_upload_pages(response):
+    # The upload pages are served from another port
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+
+@app.route("/upload", methods=["POST"])
+def upload():
+    file = request.files.get("file")
+    if file is None:
+        return jsonify({"error": "No file uploaded."}), 400
+
+    try:
+        severity = read_severity(request.form)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
+    # Repeat uploads are answered from the cache without decoding the image
+    data = file.read()
+    digest = cache.digest(data)
+    mode = request.form.get("mode")
+    key = cache.make_key(digest, "report", mode, severity)
+    result = results.get(key)
+    if result is not None:
+        return jsonify(result)
+
+    # Shed load instead of queueing without bound, so admitted uploads keep a steady latency
+    if not admission.acquire(blocking=False):
+        return busy()
+    try:
+        image = analysis.load_image(data)
+        if image is None:
+            return jsonify({"error": "Could not decode image."}), 400
+        result = report(image, mode, severity, digest)
+        results.put(key, result)
+    finally:
+        admission.release()
+    return jsonify(result)
+
+
+@app.route("/upload/stream", methods=["POST"])
+def upload_stream():
+    """
+    /upload as a streamed response: one JSON object per line (or one Server-Sent Event
+    when the client accepts text/event-stream) per stage of progressive_report.
+    """
+    file = request.files.get("file")
+    if file is None:
+        return jsonify({"error": "No file uploaded."}), 400
+    try:
+        severity = read_severity(request.form)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
+    data = file.read()
+    digest = cache.digest(data)
+    mode = request.form.get("mode")
+    sse = request.accept_mimetypes.best == "text/event-stream"
+
+    def stream(stages):
+        response = Response(stream_events(stages, sse), mimetype="text/event-stream" if sse else "application/x-ndjson")
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    # A cached report is the final answer already
+    result = results.get(cache.make_key(digest, "report", mode, severity))
+    if result is not None:
+        return stream([("full", result["colors"])])
+
+    if not admission.acquire(blocking=False):
+        return busy()
+    response = stream(progressive_report(data, mode, severity, digest))
+    response.call_on_close(admission.release)
+    return response
+
+
+@app.route("/session", methods=["POST"])
+def create_session():
+    """
+    Uploads an image once for interactive use. Returns the session id, the analysis and,
+    when a mode is given, its renders. Mode and severity switches then go to
+    /session/<id>/render and only redo the colour transforms and the preview encode.
+    """
+    file = request.files.get("file")
+    if file is None:
+        return jsonify({"error": "No file uploaded."}), 400
+    mode = request.form.get("mode")
+    if mode is not None and mode not in sessions.MODE_FAMILIES:
+        return jsonify({"error": f"mode must be one of {', '.join(sessions.MODE_FAMILIES)}."}), 400
+    try:
+        severity = read_severity(request.form)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
+    data = file.read()
+    if not admission.acquire(blocking=False):
+        return busy()
+    try:
+        image = analysis.load_image(data)
+        if image is None:
+            return jsonify({"error": "Could not decode image."}), 400
+        session, colors = open_session(image, cache.digest(data))
+        if mode is not None:
+            colors.update(render_session(session, mode, severity))
+    finally:
+        admission.release()
+    return jsonify({"session": session.id, "colors": colors})
+
+
+@app.route("/session/<session_id>/render", methods=["POST"])
+def session_render(session_id):
+    session = open_sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Unknown or expired session; upload the image again."}), 404
+    mode = request.form.get("mode")
+    if mode not in sessions.MODE_FAMILIES:
+        return jsonify({"error": f"mode must be one of {', '.join(sessions.MODE_FAMILIES)}."}), 400
+    try:
+        severity = read_severity(request.form)
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
+    # Renders already made are answered from the cache; new ones wait for the same gate as uploads
+    colors = results.get(render_key(session, mode, severity))
+    if colors is None:
+        if not admission.acquire(blocking=False):
+            return busy()
+        try:
+            colors = render_session(session, mode, severity)
+        finally:
+            admission.release()
+    return jsonify({"session": session.id, "colors": colors})
+
+
+@app.route("/session/<session_id>", methods=["DELETE"])
+def close_session(session_id):
+    if not open_sessions.close(session_id):
+        return jsonify({"error": "Unknown or expired session."}), 404
+    return jsonify({"closed": session_id})
+
+
+@app.route("/cache", methods=["GET"])
+def cache_stats():
+    return jsonify(results.stats())
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics_text():
+    gauges = {f"cache_{name}": value for name, value in results.stats().items()
+              if name in ("memory_entries", "memory_bytes", "disk_entries", "disk_bytes")}
+    gauges.update({f"sessions_{name}": value for name, value in open_sessions.stats().items()})
+    return Response(metrics.prometheus_text(gauges), mimetype="text/plain; version=0.0.4")
+
+
+if __name__ == "__main__":
+    metrics.enable()
+    warm_up()
+    app.run(host="127.0.0.1", port=5000, threaded=True)
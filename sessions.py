@@ -0,0 +1,116 @@
+""" Analysis sessions: a decoded image kept with everything derived from it, so a mode switch only redoes the last step. """
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+
+import analysis
+import cvd
+import fusedfilter
+
+# Colour-weak filter family for each colour-vision mode
+MODE_FAMILIES = {"protanopia": "red", "deuteranopia": "green", "tritanopia": "blue"}
+
+
+def preview(image, height):
+    """ Downscales an image to at most height rows. """
+    if image.shape[0] > height:
+        scale = height / image.shape[0]
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return image
+
+
+class Session:
+    """
+    One decoded BGR image with its colour planes (including the family bitmask), its
+    region tables and everything the mode renders share: the preview, the preview in
+    linear RGB and the L histogram of the full image. render() then costs one colour
+    transform per output at preview size.
+    """
+
+    def __init__(self, image, digest=None, preview_height=500):
+        self.id = secrets.token_urlsafe(16)
+        self.digest = digest
+        self.image = image
+        self.planes = analysis.build_planes(image)
+        self.regions = analysis.analyze_planes(self.planes)
+        self.preview = preview(image, preview_height)
+        self.linear = cvd.to_linear(self.preview)
+        self.l_hist = cv2.calcHist([cv2.cvtColor(image, cv2.COLOR_BGR2LAB)], [0], None, [256], [0, 256]).ravel()
+        self.nbytes = (image.nbytes + self.preview.nbytes + self.linear.nbytes
+                       + sum(plane.nbytes for plane in self.planes.values() if plane is not image))
+        self._luts = {}
+
+    def filtered(self, mode):
+        """
+        The mode's colour-weak filter applied to the preview. The L equalization uses the
+        full image's histogram, as filtering the whole image and downscaling would.
+        """
+        family = MODE_FAMILIES[mode]
+        if family not in self._luts:
+            self._luts[family] = fusedfilter.build_lut(self.l_hist, family)
+        return fusedfilter.enhance_with_lut(self.preview, family, self._luts[family])
+
+    def render(self, mode, severity=1.0):
+        """ {"filtered_image", "simulated_image", "daltonized_image"} for one mode, as BGR previews. """
+        return {
+            "filtered_image": self.filtered(mode),
+            "simulated_image": cvd.apply_linear(self.linear, mode, severity, "simulate"),
+            "daltonized_image": cvd.apply_linear(self.linear, mode, severity, "daltonize"),
+        }
+
+
+class SessionStore:
+    """
+    Open sessions by id, bounded by total bytes and idle time. Least recently
+    used sessions are dropped first; a dropped session's id simply stops resolving.
+    """
+
+    def __init__(self, max_bytes=1 << 30, idle_seconds=1800):
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._sessions = OrderedDict()  # id -> (session, last used)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _drop(self, session_id):
+        session, _ = self._sessions.pop(session_id)
+        self._size -= session.nbytes
+
+    def _expire(self, now):
+        while self._sessions:
+            session_id, (_, used) = next(iter(self._sessions.items()))
+            if now - used <= self.idle_seconds and self._size <= self.max_bytes:
+                break
+            self._drop(session_id)
+
+    def add(self, session):
+        with self._lock:
+            self._sessions[session.id] = (session, time.monotonic())
+            self._size += session.nbytes
+            self._expire(time.monotonic())
+        return session
+
+    def get(self, session_id):
+        """ The session, or None when it never existed or has been dropped. """
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            if session_id not in self._sessions:
+                return None
+            session, _ = self._sessions.pop(session_id)
+            self._sessions[session_id] = (session, now)
+            return session
+
+    def close(self, session_id):
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._drop(session_id)
+            return True
+
+    def stats(self):
+        with self._lock:
+            return {"open": len(self._sessions), "bytes": self._size}
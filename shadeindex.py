@@ -0,0 +1,120 @@
+""" Nearest-colour-name index shared by every detector that names a colour. """
+import cv2
+import numpy as np
+
+import colordata
+
+# Palettes that can be looked up by name
+PALETTES = {
+    "red": colordata.RED_SHADES,
+    "green": colordata.GREEN_SHADES,
+    "blue": colordata.BLUE_SHADES,
+    "names": colordata.COLOR_NAMES,
+}
+
+# Bits kept per channel when the index is compiled into a lookup table
+LUT_BITS = 6
+
+_indexes = {}
+
+
+def rgb_to_lab(rgb):
+    """ Converts an (..., 3) array of RGB values to 8-bit scaled LAB, as float32. """
+    rgb = np.clip(np.rint(np.asarray(rgb, np.float32)), 0, 255).astype(np.uint8)
+    lab = cv2.cvtColor(rgb.reshape(-1, 1, 3), cv2.COLOR_RGB2LAB)
+    return lab.reshape(rgb.shape).astype(np.float32)
+
+
+def _to_space(rgb, metric):
+    if metric == "lab":
+        return rgb_to_lab(rgb)
+    return np.asarray(rgb, np.float32)
+
+
+def build_index(palette, metric="lab"):
+    """
+    Compiles a {name: (r, g, b)} palette into a nearest-name index.
+    metric is "lab" for perceptual distance or "rgb" for plain RGB distance.
+    """
+    rgb = np.array(list(palette.values()), np.uint8).reshape(-1, 3)
+    points = _to_space(rgb, metric)
+    return {
+        "names": list(palette),
+        "rgb": rgb,
+        "metric": metric,
+        "points": points,
+        "norms": (points ** 2).sum(axis=1),
+        "lut": None,
+    }
+
+
+def get_index(palette, metric="lab"):
+    """ Returns the cached index for a named palette ("red", "green", "blue" or "names"). """
+    key = (palette, metric)
+    if key not in _indexes:
+        _indexes[key] = build_index(PALETTES[palette], metric)
+    return _indexes[key]
+
+
+def install_index(palette, metric, index):
+    """ Uses a prebuilt index (see colorbase) for a palette instead of building it on first use. """
+    _indexes[(palette, metric)] = index
+
+
+def nearest(index, colors, chunk=16384):
+    """
+    Returns the position of the closest palette entry for every RGB colour.
+    colors may be a single (r, g, b) or any (..., 3) array; the result has
+    the same leading shape.
+    """
+    colors = np.asarray(colors)
+    shape = colors.shape[:-1]
+    queries = _to_space(colors.reshape(-1, 3), index["metric"])
+
+    points, norms = index["points"], index["norms"]
+    result = np.empty(len(queries), np.intp)
+    for start in range(0, len(queries), chunk):
+        block = queries[start:start + chunk]
+        # |q - p|^2 without the |q|^2 term, which does not change the argmin
+        distances = norms - 2.0 * block @ points.T
+        result[start:start + chunk] = np.argmin(distances, axis=1)
+    return result.reshape(shape)
+
+
+def nearest_name(index, rgb):
+    """ Returns the name of the palette entry closest to one RGB colour. """
+    return index["names"][int(nearest(index, rgb))]
+
+
+def get_lut(index):
+    """
+    Returns the index compiled into a 3D lookup table over quantized RGB.
+    Built on first use and kept on the index.
+    """
+    if index["lut"] is None:
+        levels = 1 << LUT_BITS
+        centres = (np.arange(levels) << (8 - LUT_BITS)) + (1 << (7 - LUT_BITS))
+        r, g, b = np.meshgrid(centres, centres, centres, indexing="ij")
+        grid = np.stack([r, g, b], axis=-1)
+        dtype = np.uint8 if len(index["names"]) <= 256 else np.uint16
+        index["lut"] = nearest(index, grid).astype(dtype).reshape(-1)
+    return index["lut"]
+
+
+def quantize(image, bgr=True):
+    """ Returns the flat lookup-table cell of every pixel of an 8-bit colour image. """
+    shift = 8 - LUT_BITS
+    image = np.asarray(image)
+    if bgr:
+        r, g, b = image[..., 2], image[..., 1], image[..., 0]
+    else:
+        r, g, b = image[..., 0], image[..., 1], image[..., 2]
+    cells = (r >> shift).astype(np.int32) << (2 * LUT_BITS)
+    cells |= (g >> shift).astype(np.int32) << LUT_BITS
+    cells |= (b >> shift).astype(np.int32)
+    return cells
+
+
+def label_image(index, image, bgr=True):
+    """ Names every pixel of an image in one table lookup. Returns palette positions. """
+    return get_lut(index)[quantize(image, bgr)]
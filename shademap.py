@@ -0,0 +1,71 @@
+""" Per-pixel shade segmentation: every pixel gets a hue family and its closest shade in one lookup. """
+import cv2
+import numpy as np
+
+import analysis
+import huefamilies
+import metrics
+import shadeindex
+
+OTHER = 0
+
+_tables = {}
+
+
+def get_table(families=analysis.FAMILIES, metric="lab"):
+    """
+    Returns the cached (legend, table) for a set of families. Label 0 is "other";
+    each family's shades follow in palette order. table[f, cell] is the label of a
+    quantized colour cell for family map value f (0 = no family, i + 1 = families[i]).
+    """
+    key = (tuple(families), metric)
+    if key not in _tables:
+        legend = [{"label": OTHER, "family": "other", "name": "Other", "rgb": None, "hex": None}]
+        rows = [np.full(1 << (3 * shadeindex.LUT_BITS), OTHER, np.uint8)]
+        for family in families:
+            index = shadeindex.get_index(family, metric=metric)
+            offset = len(legend)
+            for i, name in enumerate(index["names"]):
+                rgb = tuple(int(c) for c in index["rgb"][i])
+                legend.append({"label": offset + i, "family": family, "name": name,
+                               "rgb": rgb, "hex": "#{:02x}{:02x}{:02x}".format(*rgb)})
+            rows.append((shadeindex.get_lut(index) + offset).astype(np.uint8))
+        if len(legend) > 256:
+            raise ValueError("Too many shades for a uint8 label image")
+        _tables[key] = legend, np.stack(rows)
+    return _tables[key]
+
+
+def family_map(image, families=analysis.FAMILIES):
+    """ 0 for pixels outside every family, i + 1 for families[i]. The first matching family wins. """
+    bits = huefamilies.classify(cv2.cvtColor(image, cv2.COLOR_BGR2HSV))
+    return huefamilies.first_family(bits, families)
+
+
+@metrics.timed("shade_map")
+def shade_map(image, families=analysis.FAMILIES, metric="lab"):
+    """
+    Classifies every pixel of a BGR image into a family (huefamilies.SPECS)
+    and that family's closest shade. Returns {"labels": uint8 label image,
+    "legend": one entry per label, "counts": pixels per label}.
+    """
+    legend, table = get_table(families, metric)
+    cells = shadeindex.quantize(image)
+    cells += family_map(image, families).astype(np.int32) << (3 * shadeindex.LUT_BITS)
+    labels = table.reshape(-1)[cells]
+    metrics.count("pixels_classified", labels.size)
+    return {
+        "labels": labels,
+        "legend": legend,
+        "counts": np.bincount(labels.ravel(), minlength=len(legend)),
+    }
+
+
+def summarize(result):
+    """ The legend entries present in a shade map with their pixel counts and shares, largest first. """
+    total = max(int(result["counts"].sum()), 1)
+    present = []
+    for entry, count in zip(result["legend"], result["counts"]):
+        if count:
+            present.append(dict(entry, pixels=int(count), share=count / total))
+    return sorted(present, key=lambda entry: entry["pixels"], reverse=True)
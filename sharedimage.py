@@ -0,0 +1,123 @@
+""" Images and result planes in shared memory, so pool processes work on the same pixels without copies. """
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import analysis
+import fusedfilter
+import huefamilies
+import warmup
+
+
+def _open(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Before Python 3.13 attaching always registers with the resource tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedArray:
+    """
+    A NumPy array backed by a named shared-memory block. The process that creates it
+    owns the block and unlinks it on close; other processes attach with from_handle.
+    """
+
+    def __init__(self, shape, dtype=np.uint8, name=None):
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        self.owner = name is None
+        self._memory = shared_memory.SharedMemory(create=True, size=size) if self.owner else _open(name)
+        self.array = np.ndarray(shape, dtype, buffer=self._memory.buf)
+
+    @classmethod
+    def copy_of(cls, array):
+        shared = cls(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @classmethod
+    def from_handle(cls, handle):
+        name, shape, dtype = handle
+        return cls(shape, dtype, name)
+
+    @property
+    def handle(self):
+        """ What a worker needs to attach: (name, shape, dtype). Pickles to a few bytes. """
+        return self._memory.name, self.array.shape, self.array.dtype.str
+
+    def close(self):
+        self.array = None
+        try:
+            self._memory.close()
+        except BufferError:
+            pass  # A caller still holds a view; the mapping goes when that view does
+        if self.owner:
+            self._memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def _detect(handle, families, families_handle):
+    """ Worker: region tables for every family; the family bitmask plane goes to shared memory. """
+    with SharedArray.from_handle(handle) as image, SharedArray.from_handle(families_handle) as bits:
+        planes = analysis.build_planes(image.array)
+        bits.array[...] = planes["families"]
+        result = analysis.summarize(analysis.analyze_planes(planes, families))
+        del planes
+    return result
+
+
+def _dominant(handle):
+    with SharedArray.from_handle(handle) as image:
+        return analysis.dominant_color(image.array)
+
+
+def _filter(handle, family, output_handle):
+    """ Worker: writes the filtered image straight into the caller's output buffer. """
+    with SharedArray.from_handle(handle) as image, SharedArray.from_handle(output_handle) as output:
+        output.array[...] = fusedfilter.enhance(image.array, family)
+
+
+def analyze_parallel(image, executor, families=analysis.FAMILIES, filter_family=None):
+    """
+    Runs detection, the dominant colour and optionally a colour-weak filter for one
+    BGR image in separate pool processes. The image is placed in shared memory once
+    and every worker attaches to it; the filtered image and the family bitmask plane
+    come back through shared buffers. Only region tables and palettes are pickled.
+    Returns {"families", "dominant", "family_mask"[, "filtered"]}; the planes are copied
+    out of shared memory once, in this process, so the blocks can be released.
+    """
+    mask_type = next(iter(huefamilies.get_tables().values())).dtype
+    with contextlib.ExitStack() as blocks:
+        # Every block is released on the way out, also when a worker raises
+        source = blocks.enter_context(SharedArray.copy_of(image))
+        bits = blocks.enter_context(SharedArray(image.shape[:2], mask_type))
+        output = blocks.enter_context(SharedArray(image.shape, np.uint8)) if filter_family else None
+
+        detection = executor.submit(_detect, source.handle, tuple(families), bits.handle)
+        dominant = executor.submit(_dominant, source.handle)
+        if output is not None:
+            filtered = executor.submit(_filter, source.handle, filter_family, output.handle)
+
+        try:
+            result = {"families": detection.result(), "dominant": dominant.result(), "family_mask": bits.array.copy()}
+            if output is not None:
+                filtered.result()
+                result["filtered"] = output.array.copy()
+        except BaseException:
+            # Workers may still be attached; let them finish before the blocks go
+            wait([detection, dominant] + ([filtered] if output is not None else []))
+            raise
+    return result
+
+
+def make_executor(workers=None):
+    """ A process pool with the colour tables loaded in every worker. """
+    return ProcessPoolExecutor(max_workers=workers, initializer=warmup.load_tables)
@@ -0,0 +1,144 @@
+""" A compact colour signature per image: a sparse quantized histogram that colour questions are answered from. """
+import struct
+
+import cv2
+import numpy as np
+
+import analysis
+import huefamilies
+import palette
+import shadeindex
+
+# Bits per channel: 32 levels -> 32768 bins
+SIGNATURE_BITS = 5
+
+MAGIC = b"CSIG"
+VERSION = 1
+_HEADER = struct.Struct("<4sBBIII")  # magic, version, bits, width, height, bins
+
+
+def compute(image, bits=SIGNATURE_BITS, bgr=True):
+    """
+    Builds the signature of an 8-bit colour image: the id, pixel count and mean colour
+    of every occupied bin. mean_lab is the LAB (8-bit scaled, like shadeindex) of each
+    bin's mean colour; within one bin that is as good as the mean of the LAB values.
+    """
+    cells, counts, means = palette.binned_histogram(image, bits, bgr)
+    return _signature(bits, (image.shape[1], image.shape[0]), cells, counts, means)
+
+
+def _signature(bits, size, cells, counts, means):
+    return {
+        "bits": bits,
+        "size": size,
+        "cells": cells.astype(np.int32),
+        "counts": counts.astype(np.int64),
+        "mean_rgb": means.astype(np.float32),
+        "mean_lab": shadeindex.rgb_to_lab(means),
+    }
+
+
+def coarsen(signature, bits):
+    """ Re-bins a signature at fewer bits per channel, from its bins alone. Returns (counts, mean_rgb). """
+    shift = signature["bits"] - bits
+    cells = signature["cells"]
+    mask = (1 << signature["bits"]) - 1
+    r = (cells >> (2 * signature["bits"])) >> shift
+    g = ((cells >> signature["bits"]) & mask) >> shift
+    b = (cells & mask) >> shift
+    coarse = (r << (2 * bits)) | (g << bits) | b
+
+    merged, inverse = np.unique(coarse, return_inverse=True)
+    counts = np.bincount(inverse, weights=signature["counts"], minlength=len(merged))
+    sums = np.stack([np.bincount(inverse, weights=signature["counts"] * signature["mean_rgb"][:, c],
+                                 minlength=len(merged)) for c in range(3)], axis=1)
+    return counts.astype(np.int64), sums / counts[:, None]
+
+
+def dominant_palette(signature, k=5):
+    """ The dominant colours and their shares, like palette.extract_palette on the whole image. """
+    return palette.palette_from_histogram(*coarsen(signature, palette.HISTOGRAM_BITS), k)
+
+
+def _bin_families(signature):
+    """ Family bitmask (huefamilies.classify) of every bin's mean colour. """
+    rgb = np.clip(np.rint(signature["mean_rgb"]), 0, 255).astype(np.uint8)
+    hsv = cv2.cvtColor(rgb.reshape(-1, 1, 3), cv2.COLOR_RGB2HSV)
+    return huefamilies.classify(hsv).ravel()
+
+
+def family_coverage(signature, families=analysis.FAMILIES):
+    """ Share of the image's pixels in each family's hue bands. """
+    bits = _bin_families(signature)
+    total = max(int(signature["counts"].sum()), 1)
+    return {
+        family: float(signature["counts"][huefamilies.mask(bits, family).ravel() > 0].sum() / total)
+        for family in families
+    }
+
+
+def shade_distribution(signature, families=analysis.FAMILIES):
+    """ {family: {shade: share of all pixels}}, every in-family bin named by its closest shade in LAB. """
+    bits = _bin_families(signature)
+    total = max(int(signature["counts"].sum()), 1)
+    result = {}
+    for family in families:
+        inside = huefamilies.mask(bits, family).ravel() > 0
+        index = shadeindex.get_index(family, metric="lab")
+        shares = {}
+        if inside.any():
+            nearest = shadeindex.nearest(index, signature["mean_rgb"][inside])
+            weights = np.bincount(nearest, weights=signature["counts"][inside], minlength=len(index["names"]))
+            shares = {index["names"][i]: float(weights[i] / total) for i in np.nonzero(weights)[0]}
+        result[family] = dict(sorted(shares.items(), key=lambda item: -item[1]))
+    return result
+
+
+def mood_weights(signature, families=analysis.FAMILIES):
+    """ Share of the image's pixels carrying each mood, from the shade distribution. Largest first. """
+    weights = {}
+    for family, shares in shade_distribution(signature, families).items():
+        moods = huefamilies.SPECS[family]["moods"]
+        for shade, share in shares.items():
+            if shade in moods:
+                weights[moods[shade]] = weights.get(moods[shade], 0.0) + share
+    return dict(sorted(weights.items(), key=lambda item: -item[1]))
+
+
+def to_bytes(signature):
+    """
+    Packs a signature into a small binary blob: a header, then bin ids (uint16 up to
+    5 bits per channel), counts (uint32) and mean colours rounded to uint8.
+    """
+    cell_type = np.uint16 if signature["bits"] <= 5 else np.uint32
+    width, height = signature["size"]
+    return b"".join([
+        _HEADER.pack(MAGIC, VERSION, signature["bits"], width, height, len(signature["cells"])),
+        signature["cells"].astype(cell_type).tobytes(),
+        signature["counts"].astype(np.uint32).tobytes(),
+        np.clip(np.rint(signature["mean_rgb"]), 0, 255).astype(np.uint8).tobytes(),
+    ])
+
+
+def from_bytes(data):
+    magic, version, bits, width, height, bins = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a colour signature, or one from an unsupported version")
+    cell_type = np.uint16 if bits <= 5 else np.uint32
+    offset = _HEADER.size
+    cells = np.frombuffer(data, cell_type, bins, offset)
+    offset += cells.nbytes
+    counts = np.frombuffer(data, np.uint32, bins, offset)
+    offset += counts.nbytes
+    means = np.frombuffer(data, np.uint8, bins * 3, offset).reshape(bins, 3).astype(np.float32)
+    return _signature(bits, (width, height), cells, counts, means)
+
+
+def save(signature, path):
+    with open(path, "wb") as f:
+        f.write(to_bytes(signature))
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return from_bytes(f.read())
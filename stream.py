@@ -0,0 +1,148 @@
+""" Runs the detectors and colour-weak filters over GIF and video frames, reusing work between similar frames. """
+import argparse
+import json
+import os
+import sys
+import time
+
+import cv2
+
+import analysis
+import fusedfilter
+
+# Frames are compared on tiny grey thumbnails; a frame whose mean absolute
+# difference from the last key frame is above the threshold becomes a new key frame
+THUMBNAIL_SIZE = (32, 32)
+CHANGE_THRESHOLD = 6.0
+
+# Containers VideoWriter can fill with the codecs a stock OpenCV build ships
+FOURCC = {".avi": "MJPG", ".mp4": "mp4v", ".m4v": "mp4v", ".mov": "mp4v"}
+
+
+def thumbnail(frame):
+    return cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+
+
+def frame_change(current, previous):
+    """ Mean absolute difference between two thumbnails, in 8-bit levels. """
+    return cv2.norm(current, previous, cv2.NORM_L1) / current.size
+
+
+def l_histogram(frame):
+    lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
+    return cv2.calcHist([lab], [0], None, [256], [0, 256]).ravel()
+
+
+def stream_frames(source, family=None, families=analysis.FAMILIES, threshold=CHANGE_THRESHOLD):
+    """
+    Yields one dict per frame of a GIF or video: index, key_frame, the shared
+    dominant colour and analysis, and the filtered frame when a family is given.
+    Analysis, palette and the filter's equalization table are only recomputed on
+    key frames; the frames in between reuse them and are just filtered.
+    """
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        raise ValueError(f"Could not open {source!r}")
+
+    key_thumbnail = None
+    shared = {}
+    try:
+        index = 0
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+
+            current = thumbnail(frame)
+            key_frame = key_thumbnail is None or frame_change(current, key_thumbnail) > threshold
+            if key_frame:
+                key_thumbnail = current
+                shared = {
+                    "dominant": analysis.dominant_color(frame),
+                    "analysis": analysis.analyze(frame, families) if families else None,
+                }
+                if family:
+                    shared["lut"] = fusedfilter.build_lut(l_histogram(frame), family)
+
+            result = {"index": index, "key_frame": key_frame, "dominant": shared["dominant"],
+                      "analysis": shared["analysis"]}
+            if family:
+                result["filtered"] = fusedfilter.enhance_with_lut(frame, family, shared["lut"])
+            yield result
+            index += 1
+    finally:
+        capture.release()
+
+
+def frame_rate(source, default=25.0):
+    capture = cv2.VideoCapture(source)
+    fps = capture.get(cv2.CAP_PROP_FPS)
+    capture.release()
+    return fps if fps and fps > 0 else default
+
+
+def open_writer(output_path, fps, frame):
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension not in FOURCC:
+        raise ValueError(f"Unsupported output format {extension!r}, use one of {', '.join(FOURCC)}")
+    height, width = frame.shape[:2]
+    return cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*FOURCC[extension]), fps, (width, height))
+
+
+def run(source, out, family=None, output_path=None, threshold=CHANGE_THRESHOLD, report_every=1.0):
+    """
+    Streams a clip through stream_frames, writes a JSON line per key frame to out and the
+    filtered frames to output_path, and reports sustained frames/sec on stderr.
+    """
+    writer = None
+    start = last_report = time.perf_counter()
+    count = key_frames = 0
+    try:
+        for result in stream_frames(source, family, threshold=threshold):
+            if result["key_frame"]:
+                key_frames += 1
+                out.write(json.dumps({
+                    "frame": result["index"],
+                    "dominant": result["dominant"],
+                    "families": analysis.summarize(result["analysis"]),
+                }) + "\n")
+                out.flush()
+
+            if output_path and family:
+                if writer is None:
+                    writer = open_writer(output_path, frame_rate(source), result["filtered"])
+                writer.write(result["filtered"])
+            count += 1
+
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                print(f"{count} frames, {count / (now - start):.1f} frames/sec", file=sys.stderr)
+                last_report = now
+    finally:
+        if writer is not None:
+            writer.release()
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Done: {count} frames ({key_frames} key frames) in {elapsed:.1f}s ({rate:.1f} frames/sec)",
+          file=sys.stderr)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("source", help="GIF or video file")
+    parser.add_argument("-f", "--filter", choices=sorted(fusedfilter.FILTERS),
+                        help="Colour-weak filter to apply to every frame.")
+    parser.add_argument("-o", "--output", help="Filtered video to write (.avi or .mp4). Needs --filter.")
+    parser.add_argument("--threshold", type=float, default=CHANGE_THRESHOLD,
+                        help="Mean thumbnail difference (0-255) that makes a frame a new key frame.")
+    args = parser.parse_args(argv)
+    if args.output and not args.filter:
+        parser.error("--output needs --filter")
+
+    run(args.source, sys.stdout, args.filter, args.output, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
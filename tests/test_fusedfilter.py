@@ -0,0 +1,57 @@
+""" The fused and banded filters against the step-by-step reference they replace. """
+import os
+
+import numpy as np
+import pytest
+
+import bench
+import fusedfilter
+import tiles
+
+SAMPLES = bench.sample_paths()
+FAMILIES = list(fusedfilter.FILTERS)
+TINY_SHAPES = [(1, 1), (1, 2), (2, 1), (3, 3)]
+TINY_COLORS = [(20, 20, 200), (40, 200, 40), (200, 60, 20), (0, 0, 0), (255, 255, 255)]
+
+
+@pytest.fixture(scope="module", params=SAMPLES, ids=os.path.basename)
+def sample(request):
+    image = bench.load_sample(request.param)
+    assert image is not None
+    return image
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+def test_enhance_matches_reference(sample, family):
+    assert np.array_equal(fusedfilter.enhance(sample, family), fusedfilter.enhance_reference(sample, family))
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+@pytest.mark.parametrize("color", TINY_COLORS)
+@pytest.mark.parametrize("shape", TINY_SHAPES)
+def test_enhance_matches_reference_on_tiny_images(shape, color, family):
+    image = np.full(shape + (3,), color, np.uint8)
+    assert np.array_equal(fusedfilter.enhance(image, family), fusedfilter.enhance_reference(image, family))
+
+
+@pytest.mark.parametrize("covered", [True, False])
+def test_fill_one_pixel(covered):
+    image = np.array([[[10, 20, 30]]], np.uint8)
+    mask = np.full((1, 1), 255 if covered else 0, np.uint8)
+    fusedfilter._fill(image, mask, (0, 165, 255))
+    assert image[0, 0].tolist() == ([0, 165, 255] if covered else [10, 20, 30])
+
+
+@pytest.mark.parametrize("family", FAMILIES)
+def test_enhance_tiled_matches_enhance(sample, family):
+    whole = fusedfilter.enhance(sample, family)
+    banded = tiles.enhance_tiled(sample, family)
+    if sample.shape[0] <= tiles.BAND_HEIGHT:
+        assert np.array_equal(banded, whole)
+        return
+    # Canny's hysteresis may follow an edge across a band seam further than the halo
+    # reaches, so only edge pixels may differ, and only a few of them
+    differs = (banded != whole).any(axis=2)
+    on_edge = ~banded.any(axis=2) | ~whole.any(axis=2)
+    assert on_edge[differs].all()
+    assert differs.mean() < 1e-3
@@ -0,0 +1,158 @@
+""" Banded processing for very large images: intermediates stay a few rows tall. """
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import analysis
+import fusedfilter
+import shadeindex
+
+BAND_HEIGHT = 512
+
+# Rows borrowed from each neighbour so Canny's gradients and non-maximum suppression
+# see the same pixels as on the whole image. Hysteresis can follow a weak edge
+# arbitrarily far, so a few pixels near band seams may still differ
+CANNY_HALO = 64
+
+
+def bands(height, band_height=BAND_HEIGHT):
+    """ Yields (start, stop) row ranges covering an image of the given height. """
+    for start in range(0, height, band_height):
+        yield start, min(start + band_height, height)
+
+
+def _map_bands(function, height, band_height, workers):
+    """ Runs function(start, stop) over every band, on threads; OpenCV releases the GIL. """
+    ranges = list(bands(height, band_height))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(ranges) == 1:
+        return [function(start, stop) for start, stop in ranges]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda r: function(*r), ranges))
+
+
+def enhance_tiled(image, family, band_height=BAND_HEIGHT, workers=None):
+    """
+    fusedfilter.enhance computed band by band. The L histogram is reduced over all
+    bands first so equalization matches the whole-image filter; Canny gets a halo
+    of CANNY_HALO rows on each side. Only the output is full size.
+    """
+    height = image.shape[0]
+
+    def band_histogram(start, stop):
+        lab = cv2.cvtColor(image[start:stop], cv2.COLOR_BGR2LAB)
+        return cv2.calcHist([lab], [0], None, [256], [0, 256]).ravel()
+
+    l_hist = np.sum(_map_bands(band_histogram, height, band_height, workers), axis=0)
+    lut = fusedfilter.build_lut(l_hist, family)
+    output = np.empty_like(image)
+
+    def band_filter(start, stop):
+        top = max(start - CANNY_HALO, 0)
+        bottom = min(stop + CANNY_HALO, height)
+        enhanced = fusedfilter.enhance_with_lut(image[top:bottom], family, lut)
+        output[start:stop] = enhanced[start - top:stop - top]
+
+    _map_bands(band_filter, height, band_height, workers)
+    return output
+
+
+def _band_regions(image, mask_function, start, stop):
+    """ Labels one band's mask and sums its regions' pixels. Returns the band's region table. """
+    band = image[start:stop]
+    mask = mask_function(band)
+    count, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+
+    flat = labels.ravel()
+    sums = np.stack(
+        [np.bincount(flat, weights=band[..., c].ravel(), minlength=count) for c in range(3)], axis=1
+    )
+    x, y, w, h, area = stats.T
+    return {
+        "count": count,
+        "area": area.astype(np.int64),
+        "box": np.stack([x, y + start, x + w, y + h + start], axis=1),
+        "sums": sums,
+        "first_row": labels[0].copy(),
+        "last_row": labels[-1].copy(),
+    }
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def region_table_tiled(image, mask_function, band_height=BAND_HEIGHT, workers=None):
+    """
+    Finds the 8-connected regions of mask_function(band) over the whole image, band by band,
+    and merges regions that continue across band borders.
+    Returns area, bounding box (x0, y0, x1, y1) and BGR pixel sums per region.
+    """
+    tables = _map_bands(
+        lambda start, stop: _band_regions(image, mask_function, start, stop),
+        image.shape[0], band_height, workers,
+    )
+
+    # Global ids: each band's labels are offset by the labels of the bands above it
+    offsets = np.cumsum([0] + [t["count"] for t in tables])
+    parent = list(range(int(offsets[-1])))
+    for i in range(len(tables) - 1):
+        above, below = tables[i]["last_row"], tables[i + 1]["first_row"]
+        for shift in (-1, 0, 1):
+            a = above[max(shift, 0):len(above) + min(shift, 0)]
+            b = below[max(-shift, 0):len(below) + min(-shift, 0)]
+            touching = (a > 0) & (b > 0)
+            pairs = np.unique(np.stack([a[touching], b[touching]], axis=1), axis=0)
+            for top, bottom in pairs:
+                root_a = _find(parent, int(top + offsets[i]))
+                root_b = _find(parent, int(bottom + offsets[i + 1]))
+                if root_a != root_b:
+                    parent[root_b] = root_a
+
+    # Label 0 of every band is the background
+    keep = np.concatenate([np.arange(1, t["count"]) + offsets[i] for i, t in enumerate(tables)]).astype(np.intp)
+    roots = np.array([_find(parent, int(i)) for i in keep], np.intp)
+    unique_roots, region = np.unique(roots, return_inverse=True)
+
+    area = np.concatenate([t["area"][1:] for t in tables])
+    box = np.concatenate([t["box"][1:] for t in tables])
+    sums = np.concatenate([t["sums"][1:] for t in tables])
+
+    n = len(unique_roots)
+    merged_box = np.empty((n, 4), np.int64)
+    merged_box[:, :2] = np.iinfo(np.int64).max
+    merged_box[:, 2:] = np.iinfo(np.int64).min
+    np.minimum.at(merged_box[:, 0], region, box[:, 0])
+    np.minimum.at(merged_box[:, 1], region, box[:, 1])
+    np.maximum.at(merged_box[:, 2], region, box[:, 2])
+    np.maximum.at(merged_box[:, 3], region, box[:, 3])
+    return {
+        "area": np.bincount(region, weights=area, minlength=n).astype(np.int64),
+        "box": merged_box,
+        "sums": np.stack([np.bincount(region, weights=sums[:, c], minlength=n) for c in range(3)], axis=1),
+    }
+
+
+def family_mask_function(family):
+    """ The full-resolution detection mask of analysis.DETECTION_RANGES for one family. """
+    return lambda band: analysis.family_mask(cv2.cvtColor(band, cv2.COLOR_BGR2HSV), family)
+
+
+def detect_shades_tiled(image, family, band_height=BAND_HEIGHT, workers=None, min_area=150):
+    """
+    analysis.detect_shades in bounded memory. Regions are measured on their own
+    pixels (not their bounding box) and smaller than min_area pixels are ignored.
+    """
+    table = region_table_tiled(image, family_mask_function(family), band_height, workers)
+    large = table["area"] >= min_area
+    if not large.any():
+        return []
+
+    means_bgr = table["sums"][large] / table["area"][large, None]
+    index = shadeindex.get_index(family, metric="lab")
+    return sorted({index["names"][i] for i in shadeindex.nearest(index, means_bgr[:, ::-1])})
@@ -0,0 +1,16 @@
+""" Per-process warm-up shared by the worker pools. """
+import colorbase
+import colornames
+import shadeindex
+
+
+def load_tables():
+    """
+    Gets the colour tables ready once per worker process instead of once per image:
+    mapped from the compiled colour base when it is built, else built here.
+    """
+    colorbase.install()
+    for palette in shadeindex.PALETTES:
+        shadeindex.get_index(palette, metric="lab")
+    shadeindex.get_index("names", metric="rgb")
+    colornames.load_vocabulary()